@@ -7,11 +7,48 @@ const api = axios.create({
   }
 })
 
+// Giriş yapılmışsa tüm isteklere token eklenir (backend: CachedTokenAuthentication)
+api.interceptors.request.use(config => {
+  const token = localStorage.getItem('token')
+  if (token && !config.headers.Authorization) {
+    config.headers.Authorization = `Token ${token}`
+  }
+  return config
+})
+
+// Token geçersizse (silinmiş / kullanıcı pasif) oturumu kapat
+api.interceptors.response.use(
+  response => response,
+  error => {
+    if (error.response?.status === 401 && localStorage.getItem('token')) {
+      localStorage.removeItem('token')
+      localStorage.removeItem('user')
+      window.location.reload()
+    }
+    return Promise.reject(error)
+  }
+)
+
+// List endpoint'leri cursor ile sayfalanır ({ next, previous, results }).
+// Tüm sayfaları toplar; bileşenler eskisi gibi response.data'yı dizi olarak alır.
+async function listAll(url, params) {
+  let response = await api.get(url, { params })
+  if (!Array.isArray(response.data?.results)) {
+    return response
+  }
+  const results = [...response.data.results]
+  while (response.data.next) {
+    response = await api.get(response.data.next)
+    results.push(...response.data.results)
+  }
+  return { ...response, data: results }
+}
+
 // API servis fonksiyonları
 export default {
   // Courses
-  getCourses() {
-    return api.get('courses/')
+  getCourses(params) {
+    return listAll('courses/', params)
   },
   getCourse(id) {
     return api.get(`courses/${id}/`)
@@ -19,6 +56,15 @@ export default {
   getCourseDetail(id) {
     return api.get(`courses/${id}/detail/`)
   },
+  getMappingGraph(courseId) {
+    return api.get(`courses/${courseId}/mapping-graph/`)
+  },
+  saveMappingGraph(courseId, graph) {
+    return api.put(`courses/${courseId}/mapping-graph/`, graph)
+  },
+  getCourseAttainment(id, threshold) {
+    return api.get(`courses/${id}/attainment/`, { params: { threshold } })
+  },
   createCourse(data) {
     return api.post('courses/', data)
   },
@@ -27,8 +73,8 @@ export default {
   },
   
   // Program Outcomes
-  getProgramOutcomes() {
-    return api.get('program-outcomes/')
+  getProgramOutcomes(params) {
+    return listAll('program-outcomes/', params)
   },
   createProgramOutcome(data) {
     return api.post('program-outcomes/', data)
@@ -41,8 +87,8 @@ export default {
   },
   
   // Learning Outcomes
-  getLearningOutcomes() {
-    return api.get('learning-outcomes/')
+  getLearningOutcomes(params) {
+    return listAll('learning-outcomes/', params)
   },
   getLearningOutcome(id) {
     return api.get(`learning-outcomes/${id}/`)
@@ -64,11 +110,11 @@ export default {
   },
   
   // LO to PO Mappings
-  getMappings() {
-    return api.get('mappings/')
+  getMappings(params) {
+    return listAll('mappings/', params)
   },
-  getLoToPoMappings() {
-    return api.get('mappings/')
+  getLoToPoMappings(params) {
+    return listAll('mappings/', params)
   },
   createMapping(data) {
     return api.post('mappings/', data)
@@ -84,8 +130,8 @@ export default {
   },
   
   // Students
-  getStudents() {
-    return api.get('students/')
+  getStudents(params) {
+    return listAll('students/', params)
   },
   getStudent(id) {
     return api.get(`students/${id}/`)
@@ -99,18 +145,22 @@ export default {
   getStudentPoScores(studentId) {
     return api.get(`students/${studentId}/po_scores/`)
   },
+  // Toplu PO skorları: { course, semester, department, ids, page, page_size }
+  getPoScores(params) {
+    return api.get('po-scores/', { params })
+  },
   
   // Assessments
-  getAssessments() {
-    return api.get('assessments/')
+  getAssessments(params) {
+    return listAll('assessments/', params)
   },
   createAssessment(data) {
     return api.post('assessments/', data)
   },
   
   // Assessment to LO Mappings
-  getAssessmentToLoMappings() {
-    return api.get('assessment-to-lo-mappings/')
+  getAssessmentToLoMappings(params) {
+    return listAll('assessment-to-lo-mappings/', params)
   },
   createAssessmentToLoMapping(data) {
     return api.post('assessment-to-lo-mappings/', data)
@@ -123,17 +173,71 @@ export default {
   },
   
   // Grades
-  getGrades() {
-    return api.get('grades/')
+  getGrades(params) {
+    return listAll('grades/', params)
   },
   createGrade(data) {
     return api.post('grades/', data)
   },
+  // rows: [{ student_no, assessment, points }] veya CSV File
+  bulkUploadGrades(rowsOrFile) {
+    if (rowsOrFile instanceof File) {
+      const form = new FormData()
+      form.append('file', rowsOrFile)
+      return api.post('grades/bulk/', form, { headers: { 'Content-Type': 'multipart/form-data' } })
+    }
+    return api.post('grades/bulk/', rowsOrFile)
+  },
+  
+  // CSV export (streaming) - indirme linki olarak kullanılır
+  gradesExportUrl(params = {}) {
+    return api.getUri({ url: 'grades/export.csv', params })
+  },
+  poScoresExportUrl(params = {}) {
+    return api.getUri({ url: 'reports/po-scores.csv', params })
+  },
   
   // Chat
   chatWithGemini(message) {
     return api.post('chat/', { message })
   },
+  // SSE stream (?stream=1): her parça geldikçe onDelta(text) çağrılır
+  async chatStream(message, onDelta) {
+    const response = await fetch(api.getUri({ url: 'chat/', params: { stream: 1 } }), {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ message })
+    })
+    // Hata yanıtı (JSON / HTML) SSE değildir: axios hataları gibi { response: { status, data } } ile fırlat
+    if (!response.ok) {
+      const text = await response.text()
+      let data
+      try {
+        data = JSON.parse(text)
+      } catch {
+        data = { error: text }
+      }
+      const error = new Error(data.error || data.detail || `HTTP ${response.status}`)
+      error.response = { status: response.status, data }
+      throw error
+    }
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    for (;;) {
+      const { value, done } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      const events = buffer.split('\n\n')
+      buffer = events.pop()
+      for (const raw of events) {
+        const event = raw.match(/^event: (.*)$/m)?.[1]
+        const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || '{}')
+        if (event === 'delta') onDelta(data.text)
+        if (event === 'error') throw new Error(data.error)
+      }
+    }
+  },
 
   // Auth
   login(username, password) {
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     Course, ProgramOutcome, LearningOutcome, 
-    LoToPoMapping, Student, Assessment, AssessmentToLoMapping, Grade
+    LoToPoMapping, Student, Assessment, AssessmentToLoMapping, Grade, StudentPoScore,
+    TermSnapshot, StudentPoSnapshot, CourseOutcomeSnapshot, PoTermRollup
 )
 
 # Register your models here.
@@ -59,3 +60,37 @@ class GradeAdmin(admin.ModelAdmin):
     list_display = ['student', 'assessment', 'points', 'percentage']
     list_filter = ['assessment__course']
     search_fields = ['student__student_no', 'assessment__name']
+
+
+@admin.register(StudentPoScore)
+class StudentPoScoreAdmin(admin.ModelAdmin):
+    list_display = ['student', 'program_outcome', 'score', 'weighted_sum', 'weight_sum']
+    list_filter = ['program_outcome']
+    search_fields = ['student__student_no']
+
+
+@admin.register(TermSnapshot)
+class TermSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['semester', 'closed_at', 'closed_by', 'course_count', 'student_count']
+    readonly_fields = ['closed_at']
+
+
+@admin.register(StudentPoSnapshot)
+class StudentPoSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['snapshot', 'student_no', 'po_code', 'score']
+    list_filter = ['snapshot', 'po_code']
+    search_fields = ['student_no']
+
+
+@admin.register(CourseOutcomeSnapshot)
+class CourseOutcomeSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['snapshot', 'course_code', 'kind', 'outcome_code', 'average', 'above_threshold_percent']
+    list_filter = ['snapshot', 'kind']
+    search_fields = ['course_code', 'outcome_code']
+
+
+@admin.register(PoTermRollup)
+class PoTermRollupAdmin(admin.ModelAdmin):
+    list_display = ['semester', 'course_code', 'po_code', 'department', 'score_sum', 'student_count', 'updated_at']
+    list_filter = ['semester', 'department', 'po_code']
+    search_fields = ['course_code']
@@ -0,0 +1,86 @@
+"""
+Çok yıllı PO trendleri (GET /api/analytics/po-trends/).
+
+Trendler notlardan değil, PoTermRollup satırlarından hesaplanır: her satır
+(dönem, ders, PO) için öğrenci PO skorlarının toplamını ve sayısını tutar.
+Bir dilimin ortalaması Σ score_sum / Σ student_count olduğundan herhangi bir
+dönem / ders / bölüm kesiti birkaç yüz satırın toplanmasıyla cevaplanır.
+
+Rollup'lar dönem kapatılırken (close_term) yazılır ve sonra değişmez; açık
+dönemler `manage.py rollup_po_trends` ile tazelenir.
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .attainment import outcome_summaries
+from .models import Course, PoTermRollup, TermSnapshot
+
+# Dönem adındaki sezon → yıl içi sıra ('2024-Fall', '2025-Bahar' ...)
+SEASONS = {'spring': 0, 'bahar': 0, 'summer': 1, 'yaz': 1, 'fall': 2, 'autumn': 2, 'güz': 2}
+GROUPS = {'po': [], 'course': ['course_code'], 'department': ['department']}
+
+
+def term_key(semester):
+    """Dönemleri kronolojik sıralamak için anahtar; yılı olmayanlar sona"""
+    year = re.search(r'\d{4}', semester)
+    season = next((order for name, order in SEASONS.items() if name in semester.lower()), len(SEASONS))
+    return (int(year.group()) if year else 9999, season, semester)
+
+
+@transaction.atomic
+def refresh_term_rollups(semester):
+    """
+    Dönemin (dönem, ders, PO) rollup'larını canlı verilerden yeniden yaz.
+    Kapatılmış dönemlerin rollup'ları değişmez (ValueError).
+    """
+    if TermSnapshot.objects.filter(semester=semester).exists():
+        raise ValueError(f"{semester} dönemi kapatılmış; rollup'ları değiştirilemez")
+
+    rollups = []
+    for course in Course.objects.filter(semester=semester).order_by('code'):
+        for kind, po_id, po_code, _, students, score_sum, *_ in outcome_summaries(course):
+            if kind == 'po':
+                rollups.append(PoTermRollup(
+                    semester=semester, course=course, course_code=course.code,
+                    department=course.department, program_outcome_id=po_id, po_code=po_code,
+                    score_sum=score_sum, student_count=students,
+                ))
+    PoTermRollup.objects.filter(semester=semester).delete()
+    PoTermRollup.objects.bulk_create(rollups)
+    return len(rollups)
+
+
+def po_trends(from_term=None, to_term=None, departments=None, courses=None, group='po'):
+    """Dönem sırasına göre PO ortalama serileri (2 sorgu)"""
+    rollups = PoTermRollup.objects.order_by()
+    if departments:
+        rollups = rollups.filter(department__in=departments)
+    if courses:
+        rollups = rollups.filter(course_code__in=courses)
+
+    terms = sorted(rollups.values_list('semester', flat=True).distinct(), key=term_key)
+    if from_term:
+        terms = [term for term in terms if term_key(term) >= term_key(from_term)]
+    if to_term:
+        terms = [term for term in terms if term_key(term) <= term_key(to_term)]
+
+    keys = ['po_code', *GROUPS[group]]
+    rows = rollups.filter(semester__in=terms).values('semester', *keys).annotate(
+        total=Sum('score_sum'), count=Sum('student_count'), course_count=Count('course_code', distinct=True),
+    )
+
+    order = {term: i for i, term in enumerate(terms)}
+    series = {}
+    for row in sorted(rows, key=lambda row: (*(row[key] for key in keys), order[row['semester']])):
+        key = tuple(row[key] for key in keys)
+        if key not in series:
+            series[key] = {**dict(zip(keys, key)), 'points': []}
+        series[key]['points'].append({
+            'semester': row['semester'],
+            'average': round(row['total'] / row['count'], 2) if row['count'] else 0,
+            'count': row['count'],
+            'courses': row['course_count'],
+        })
+    return {'terms': terms, 'group': group, 'series': list(series.values())}
@@ -0,0 +1,135 @@
+"""
+Ders bazında LO / PO başarı raporu (GET /api/courses/{id}/attainment/).
+
+Öğrenci başına LO ve PO skorları, PO skorlarıyla aynı formülle ama sadece
+dersin assessment'ları üzerinden veritabanında hesaplanır:
+    skor(öğrenci, LO) = Σ yüzde(a) * w(a→LO) / Σ w(a→LO)
+    skor(öğrenci, PO) = Σ yüzde(a) * w(a→LO) * w(LO→PO) / Σ w(a→LO) * w(LO→PO)
+Bu iki gruplanmış ORM sorgusu derived table olarak sarılır ve LO/PO başına
+ortalama, dağılım ve eşik üstü yüzdesi tek bir sorguda (UNION ALL) toplanır;
+dönen satır sayısı öğrenci sayısından bağımsızdır.
+"""
+import math
+
+from django.db import connection
+from django.db.models import Case, F, FloatField, Sum, Value, When
+
+from .models import Grade
+
+DEFAULT_THRESHOLD = 60
+# Dağılım aralıkları [alt, üst); son aralık 100'ü de içerir
+BUCKETS = [(0, 20), (20, 40), (40, 60), (60, 80), (80, None)]
+
+
+
+def parse_threshold(value):
+    """Başarı eşiği: 0-100 arası sonlu sayı; 'nan', 'inf', bool veya aralık dışı ValueError"""
+    if isinstance(value, bool):
+        raise ValueError(value)
+    threshold = float(value)
+    if not math.isfinite(threshold) or not 0 <= threshold <= 100:
+        raise ValueError(value)
+    return threshold
+
+
+LO_WEIGHT = 'assessment__lo_mappings__contribution_weight'
+PO_WEIGHT = 'assessment__lo_mappings__learning_outcome__po_mappings__contribution_weight'
+
+
+def grade_percentage():
+    """points / total_points * 100 (total_points 0 ise 0)"""
+    return Case(
+        When(
+            assessment__total_points__gt=0,
+            then=F('points') * 100 / F('assessment__total_points'),
+        ),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def lo_student_scores(course):
+    """(öğrenci, LO) başına weighted / weight toplamları"""
+    return Grade.objects.filter(assessment__course=course).order_by().values(
+        'student_id',
+        outcome_id=F('assessment__lo_mappings__learning_outcome_id'),
+        code=F('assessment__lo_mappings__learning_outcome__code'),
+        description=F('assessment__lo_mappings__learning_outcome__description'),
+    ).annotate(
+        weighted=Sum(grade_percentage() * F(LO_WEIGHT), output_field=FloatField()),
+        weight=Sum(LO_WEIGHT, output_field=FloatField()),
+    )
+
+
+def po_student_scores(course):
+    """(öğrenci, PO) başına weighted / weight toplamları"""
+    po = 'assessment__lo_mappings__learning_outcome__po_mappings__program_outcome'
+    return Grade.objects.filter(assessment__course=course).order_by().values(
+        'student_id',
+        outcome_id=F(f'{po}_id'),
+        code=F(f'{po}__code'),
+        description=F(f'{po}__description'),
+    ).annotate(
+        weighted=Sum(grade_percentage() * F(LO_WEIGHT) * F(PO_WEIGHT), output_field=FloatField()),
+        weight=Sum(F(LO_WEIGHT) * F(PO_WEIGHT), output_field=FloatField()),
+    )
+
+
+def _summary_sql(kind, queryset):
+    """Öğrenci skorlarını outcome başına özetleyen SELECT (derived table üzerinde)"""
+    inner, params = queryset.query.sql_with_params()
+    buckets = ', '.join(
+        f"SUM(CASE WHEN score >= {low}{f' AND score < {high}' if high else ''} THEN 1 ELSE 0 END)"
+        for low, high in BUCKETS
+    )
+    sql = (
+        f"SELECT '{kind}', outcome_id, code, description, COUNT(*), SUM(score), "
+        f"SUM(CASE WHEN score >= %s THEN 1 ELSE 0 END), {buckets} "
+        f"FROM (SELECT outcome_id, code, description, "
+        f"CASE WHEN weight > 0 THEN weighted / weight ELSE 0 END AS score "
+        f"FROM ({inner}) student_scores) scores "
+        f"GROUP BY outcome_id, code, description"
+    )
+    return sql, params
+
+
+def bucket_label(low, high):
+    return f"{low}-{high}" if high else f"{low}-100"
+
+
+def outcome_summaries(course, threshold=DEFAULT_THRESHOLD):
+    """
+    Ham özet satırları (tek sorgu):
+    (kind, outcome_id, code, description, öğrenci sayısı, skor toplamı, eşik üstü, *dağılım)
+    """
+    lo_sql, lo_params = _summary_sql('lo', lo_student_scores(course))
+    po_sql, po_params = _summary_sql('po', po_student_scores(course))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"{lo_sql} UNION ALL {po_sql} ORDER BY 1, 3",
+            (threshold, *lo_params, threshold, *po_params),
+        )
+        # Mapping'i olmayan assessment / LO notları (LEFT JOIN) özete girmez
+        return [row for row in cursor.fetchall() if row[1] is not None]
+
+
+def course_attainment(course, threshold=DEFAULT_THRESHOLD):
+    """Dersin LO ve PO başarı özeti (tek sorgu)"""
+    report = {'learning_outcomes': [], 'program_outcomes': []}
+    for kind, outcome_id, code, description, students, score_sum, above, *buckets in outcome_summaries(course, threshold):
+        report['learning_outcomes' if kind == 'lo' else 'program_outcomes'].append({
+            'id': outcome_id,
+            'code': code,
+            'description': description,
+            'students': students,
+            'average': round(score_sum / students, 2),
+            'above_threshold_percent': round(above * 100 / students, 2),
+            'distribution': {
+                bucket_label(low, high): count for (low, high), count in zip(BUCKETS, buckets)
+            },
+        })
+    return {
+        'course': {'id': course.id, 'code': course.code, 'name': course.name},
+        'threshold': threshold,
+        **report,
+    }
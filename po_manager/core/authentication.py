@@ -0,0 +1,131 @@
+"""
+Cache'li token authentication (REST_FRAMEWORK varsayılanı).
+
+DRF TokenAuthentication her istekte token + kullanıcı (+ profil) sorgusu
+yapar. Burada token → (USER_FIELDS, user_type) AUTH_TOKEN_CACHE_TIMEOUT
+süresince cache'lenir; cache isabetinde veritabanına gidilmez.
+
+`request.user` sadece USER_FIELDS'i yüklü bir User'dır: bu alanlar sorgusuz
+okunur, diğerleri (password, last_login, date_joined, `profile` ...) ilk
+erişimde birer sorgu yapar. user_type için `request.auth.user_type`
+kullanılmalı; `request.auth` key / user_id / user_type taşıyan bir CachedToken'dır.
+
+Cache; logout'ta, token silinince ve kullanıcı ya da profili kaydedilince
+geçersiz kılınır. Process'e özel cache'lerde (LocMemCache) bir worker'daki
+silme diğer worker'lara ulaşmaz: orada key, veritabanındaki AUTH_TOKENS
+sayacını içerir ve her geçersiz kılma sayacı artırır. Sayaç process içinde
+AUTH_TOKEN_VERSION_TTL saniye tutulur: aynı worker'daki geçersiz kılma hemen,
+diğer worker'lardaki en geç bu süre sonunda görülür.
+Paylaşılan cache'lerde (Redis, memcached, DB) key'ler doğrudan silinir.
+"""
+import hashlib
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .caching import bump_version, get_version
+from .models import UserProfile
+
+AUTH_TOKENS = 'auth_tokens'
+
+CachedToken = namedtuple('CachedToken', ['key', 'user_id', 'user_type'])
+
+# request.user'da sorgusuz okunabilen alanlar (kullanıcı kaydedilince cache temizlenir).
+# Model.from_db değerleri model alan sırasıyla bekler.
+USER_FIELDS = ('id', 'is_superuser', 'username', 'first_name', 'last_name', 'email', 'is_staff', 'is_active')
+
+# (AUTH_TOKENS versiyonu, geçerlilik sonu) - process içi
+_generation = None
+
+
+def process_local_cache():
+    return isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def token_generation():
+    """AUTH_TOKENS versiyonu; AUTH_TOKEN_VERSION_TTL içinde tekrar sorgulanmaz"""
+    global _generation
+    now = time.monotonic()
+    if _generation is None or _generation[1] <= now:
+        _generation = (get_version(AUTH_TOKENS), now + settings.AUTH_TOKEN_VERSION_TTL)
+    return _generation[0]
+
+
+def reset_token_generation():
+    global _generation
+    _generation = None
+
+
+def token_cache_key(key):
+    # Token'ın kendisi cache key'inde (paylaşılan cache'lerde) açıkta durmaz
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    if process_local_cache():
+        return f'auth_token:v{token_generation()}:{digest}'
+    return f'auth_token:{digest}'
+
+
+def invalidate_token(key):
+    cache.delete(token_cache_key(key))
+    if process_local_cache():
+        # Diğer worker'ların cache'indeki girdiler: sayaç artınca key'leri bir daha okunmaz.
+        # Transaction içinde artırılır: geri alınırsa token da silinmemiş olur.
+        bump_version(AUTH_TOKENS)
+        reset_token_generation()
+
+
+def user_type_of(user):
+    """Profil yoksa 'instructor' (login_view ile aynı varsayılan)"""
+    try:
+        return user.profile.user_type
+    except UserProfile.DoesNotExist:
+        return 'instructor'
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """`Authorization: Token <key>`; token → (user id, user_type) cache'lenir"""
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        entry = cache.get(cache_key)
+        if entry is None:
+            try:
+                token = Token.objects.select_related('user__profile').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Geçersiz token')
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed('Kullanıcı aktif değil')
+            entry = ([getattr(token.user, field) for field in USER_FIELDS], user_type_of(token.user))
+            cache.set(cache_key, entry, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+
+        values, user_type = entry
+        # Sadece USER_FIELDS yüklü; diğer alanlar ilk erişimde veritabanından gelir
+        user = User.from_db(DEFAULT_DB_ALIAS, USER_FIELDS, values)
+        return user, CachedToken(key, user.pk, user_type)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserProfile)
+def token_owner_changed(sender, instance, raw=False, update_fields=None, **kwargs):
+    """is_active veya user_type değişmiş olabilir"""
+    # Login sadece last_login'i günceller
+    if raw or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    user_id = instance.pk if sender is User else instance.user_id
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
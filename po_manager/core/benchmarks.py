@@ -0,0 +1,129 @@
+"""
+Skorlama ve list endpoint'leri için benchmark senaryoları.
+
+Her senaryo mevcut veritabanında `iterations` kez çalıştırılır ve throughput,
+p50/p95 gecikme, istek başına sorgu sayısı ve (ayrı bir çalıştırmada
+tracemalloc ile) peak bellek ölçülür. Sentetik veri `manage.py benchmark`
+komutunda `throwaway_database()` içinde hazırlanır.
+"""
+import statistics
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+from .chat_utils import get_all_po_stats
+from .metrics import quantile
+from .models import Course, Grade, Student
+
+
+@contextmanager
+def throwaway_database(sqlite_name='po_manager_benchmark.sqlite3'):
+    """
+    Blok geçici bir test veritabanında çalışır (Django test DB'si: `test_<NAME>`),
+    sonunda veritabanı silinir ve bağlantı asıl veritabanına döner.
+    """
+    setup_test_environment()
+    # SQLite test veritabanı varsayılan olarak bellekte: gerçekçi olması için dosyada
+    if connection.vendor == 'sqlite' and not connection.settings_dict['TEST']['NAME']:
+        connection.settings_dict['TEST']['NAME'] = str(Path(tempfile.gettempdir()) / sqlite_name)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+class QueryCounter:
+    """connection.execute_wrapper: çalışan sorgu sayısı"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(run, iterations, warmup=2):
+    """`run(i)` için gecikme / sorgu / bellek istatistikleri"""
+    for i in range(warmup):
+        run(i)
+
+    timings = []
+    queries = []
+    for i in range(iterations):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            run(i)
+            timings.append(time.perf_counter() - started)
+        queries.append(counter.count)
+
+    tracemalloc.start()
+    try:
+        run(0)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'throughput_per_s': round(iterations / sum(timings), 2),
+        'mean_ms': round(statistics.fmean(timings) * 1000, 3),
+        'p50_ms': round(quantile(timings, 0.5) * 1000, 3),
+        'p95_ms': round(quantile(timings, 0.95) * 1000, 3),
+        'max_ms': round(timings[-1] * 1000, 3),
+        'queries': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def _ok(response):
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.status_code}: {response.content[:200]!r}")
+    return response
+
+
+def run_benchmarks(iterations=50, bulk_rows=500, page_size=100):
+    """Senaryoları çalıştır: {senaryo: istatistikler}"""
+    client = APIClient()
+    student_ids = list(Student.objects.order_by('id').values_list('id', flat=True))
+    course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+    # Toplu girişte mevcut notlar güncellenir: her iterasyon farklı bir dilim
+    existing = list(
+        Grade.objects.order_by('id')
+        .values_list('student__student_no', 'assessment_id', 'points')[:bulk_rows * 4]
+    )
+    if not (student_ids and course_ids and existing):
+        raise ValueError("Benchmark için öğrenci, ders ve not verisi gerekli")
+
+    def po_scores(i):
+        _ok(client.get(f'/api/students/{student_ids[i * 7919 % len(student_ids)]}/po_scores/'))
+
+    def grades_list(i):
+        _ok(client.get('/api/grades/', {'course': course_ids[i % len(course_ids)], 'page_size': page_size}))
+
+    def bulk_ingest(i):
+        start = (i % 4) * bulk_rows
+        rows = [
+            {'student_no': student_no, 'assessment': a_id, 'points': (points + i) % 100}
+            for student_no, a_id, points in existing[start:start + bulk_rows]
+        ]
+        result = _ok(client.post('/api/grades/bulk/', rows, format='json')).json()
+        if result['errors']:
+            raise RuntimeError(result['errors'][:3])
+
+    return {
+        'po_scores': measure(po_scores, iterations),
+        'get_all_po_stats': measure(lambda i: get_all_po_stats(), max(1, iterations // 10), warmup=1),
+        'grades_list': measure(grades_list, iterations),
+        'bulk_ingest': measure(bulk_ingest, max(1, iterations // 10), warmup=1),
+    }
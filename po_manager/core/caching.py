@@ -0,0 +1,84 @@
+"""
+Veri versiyonlu cache yardımcıları.
+
+Cache key'leri ilgili DataVersion sayacını içerir: veri değişince sayaç
+artırılır ve eski key'ler bir daha okunmaz (süreleri dolunca silinir).
+Sayaç veritabanında tutulduğu için process'e özel (locmem) cache'lerde de
+tüm worker'lar invalidation'ı görür.
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DataVersion
+
+PO_STATS = 'po_stats'
+# Mapping tabloları / PO'lar / assessment total_points: process içi MappingGraph cache'i
+MAPPING_GRAPH = 'mapping_graph'
+
+_state = threading.local()
+_before_flush = []
+
+
+def get_version(name):
+    version = DataVersion.objects.filter(name=name).values_list('version', flat=True).first()
+    return version or 0
+
+
+def bump_version(name):
+    now = timezone.now()
+    updated = DataVersion.objects.filter(name=name).update(version=F('version') + 1, updated_at=now)
+    if not updated:
+        DataVersion.objects.get_or_create(name=name, defaults={'version': 1, 'updated_at': now})
+
+
+def table_version(model):
+    """Tablo başına versiyon sayacının adı (HTTP ETag / Last-Modified için)"""
+    return f'table:{model._meta.db_table}'
+
+
+def mark_tables_changed(*models):
+    """Signal göndermeyen toplu yazımlardan sonra tablo versiyonlarını artır"""
+    for model in models:
+        mark_changed(table_version(model))
+
+
+def versioned_key(name, *parts):
+    return ':'.join([name, f'v{get_version(name)}', *map(str, parts)])
+
+
+def mark_changed(name):
+    """Versiyonu commit sonrası bir kez artır (cascade'lerde satır başına değil)"""
+    if not hasattr(_state, 'names'):
+        _state.names = set()
+    _state.names.add(name)
+    transaction.on_commit(flush_versions)
+
+
+def before_version_flush(callback):
+    """
+    `callback` (skor hücrelerinin refresh'i) MAPPING_GRAPH artırıldıktan sonra,
+    diğer sayaçlardan önce çalışır: yeni po_stats / tablo versiyonu eski skorlarla
+    cache'lenmesin, ETag'lenmesin.
+    """
+    _before_flush.append(callback)
+
+
+def flush_versions(*only):
+    """
+    Bekleyen versiyon artışlarını uygula (commit sonrası; birden çok kez çağrılabilir).
+    `only` verilirse sadece o sayaçlar artırılır.
+    """
+    names = getattr(_state, 'names', set())
+    for name in only or (MAPPING_GRAPH,):
+        if name in names:
+            names.discard(name)
+            bump_version(name)
+    if only:
+        return
+    for callback in _before_flush:
+        callback()
+    while names:
+        bump_version(names.pop())
@@ -1,54 +1,32 @@
-import google.generativeai as genai
-from django.conf import settings
-from .models import ProgramOutcome, Student, LoToPoMapping, AssessmentToLoMapping, Grade
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+import numpy as np
+from .caching import PO_STATS, versioned_key
+from .llm import generate, generate_stream
+from .scoring import cached_graph, cohort_scores, normalize
+
+PO_STATS_CACHE_TIMEOUT = 60 * 60 * 24
 
 def get_all_po_stats():
     """
     Calculates average PO scores across all students.
     Returns a dictionary with PO codes and their average scores.
     """
-    students = Student.objects.all()
-    pos = ProgramOutcome.objects.all()
+    graph = cached_graph()
+    pos = graph.program_outcomes
     
-    po_totals = {po.code: {'total_score': 0, 'count': 0, 'description': po.description} for po in pos}
+    po_totals = {po['code']: {'total_score': 0, 'count': 0, 'description': po['description']} for po in pos}
     
-    for student in students:
-        # Calculate PO scores for this student (reusing logic from views.py)
-        # Ideally this logic should be centralized, but for now I'll duplicate/adapt it for batch processing
-        
-        for po in pos:
-            lo_mappings = LoToPoMapping.objects.filter(program_outcome=po)
-            
-            total_weighted_score = 0
-            total_weight_sum = 0
-            
-            for lo_map in lo_mappings:
-                lo = lo_map.learning_outcome
-                lo_po_weight = lo_map.contribution_weight
-                
-                assess_mappings = AssessmentToLoMapping.objects.filter(learning_outcome=lo)
-                
-                for assess_map in assess_mappings:
-                    assessment = assess_map.assessment
-                    assess_lo_weight = assess_map.contribution_weight
-                    
-                    try:
-                        grade = Grade.objects.get(assessment=assessment, student=student)
-                        score = grade.percentage
-                        
-                        contribution = score * assess_lo_weight * lo_po_weight
-                        weight_factor = assess_lo_weight * lo_po_weight
-                        
-                        total_weighted_score += contribution
-                        total_weight_sum += weight_factor
-                        
-                    except Grade.DoesNotExist:
-                        continue
-            
-            if total_weight_sum > 0:
-                normalized_score = total_weighted_score / total_weight_sum
-                po_totals[po.code]['total_score'] += float(normalized_score)
-                po_totals[po.code]['count'] += 1
+    # Öğrenciler chunk'lar halinde: (students × assessments) @ (assessments × POs)
+    for _, weighted, weight_sums in cohort_scores(graph=graph):
+        for p, po in enumerate(pos):
+            totals = po_totals[po['code']]
+            for row in np.flatnonzero(weight_sums[:, p] > 0):
+                totals['total_score'] += normalize(weighted[row, p], weight_sums[row, p])
+                totals['count'] += 1
     
     # Calculate averages
     po_stats = []
@@ -63,17 +41,20 @@ def get_all_po_stats():
         
     return po_stats
 
-def chat_with_gemini(user_message, api_key):
+def get_cached_po_stats():
     """
-    Sends the user message and context to Gemini.
+    get_all_po_stats() sonucu, veri versiyonuna bağlı cache'ten.
+    Grade, mapping veya PO değişince versiyon artar ve bir sonraki çağrı yeniden hesaplar.
     """
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
-    # Gather context
-    po_stats = get_all_po_stats()
-    
-    context_prompt = f"""
+    key = versioned_key(PO_STATS)
+    po_stats = cache.get(key)
+    if po_stats is None:
+        po_stats = get_all_po_stats()
+        cache.set(key, po_stats, PO_STATS_CACHE_TIMEOUT)
+    return po_stats
+
+def build_chat_prompt(user_message, po_stats):
+    return f"""
     You are an AI assistant for an Outcome Based Education (OBS) system.
     Here is the current data for Program Outcomes (PO) based on student performance:
     
@@ -86,6 +67,32 @@ def chat_with_gemini(user_message, api_key):
     If they ask for a summary, provide a brief overview.
     Keep your answer concise and helpful.
     """
-    
-    response = model.generate_content(context_prompt)
-    return response.text
+
+async def chat(user_message):
+    """
+    Sends the user message and PO context to the configured LLM backend.
+    """
+    # Gather context (sync ORM + cache)
+    po_stats = await sync_to_async(get_cached_po_stats)()
+    return await generate(build_chat_prompt(user_message, po_stats))
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def chat_events(user_message):
+    """
+    Server-Sent Events: open → delta (her parça) → done, hata olursa error.
+    PO context'i 'open' olayı gönderilirken paralel hesaplanır.
+    """
+    po_stats = asyncio.ensure_future(sync_to_async(get_cached_po_stats)())
+    yield sse_event('open', {})
+    try:
+        prompt = build_chat_prompt(user_message, await po_stats)
+        async for chunk in generate_stream(prompt):
+            yield sse_event('delta', {'text': chunk})
+        yield sse_event('done', {})
+    except Exception as e:
+        yield sse_event('error', {'error': str(e)})
+    finally:
+        po_stats.cancel()
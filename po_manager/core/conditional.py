@@ -0,0 +1,80 @@
+"""
+HTTP conditional GET (ETag / Last-Modified) for read-heavy ViewSets.
+
+ETag, yanıtın dayandığı tabloların DataVersion sayaçlarından (tek sorgu)
+üretilir; Last-Modified bu sayaçların son artırılma zamanıdır. İstemci
+If-None-Match / If-Modified-Since gönderir ve veri değişmemişse 304 döner:
+queryset çalıştırılmaz, hiçbir şey serialize edilmez.
+
+Sayaçlar signals.py'de model save/delete ile, toplu yazımlarda elle
+(`mark_tables_changed`) commit sonrası artırılır.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .caching import table_version
+from .models import DataVersion
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    `version_sources`: list / retrieve yanıtının dayandığı modeller veya DataVersion adları.
+    `action_version_sources`: @action'lar için aynısı; burada olmayan action'lar koşulsuz.
+    """
+    version_sources = ()
+    action_version_sources = {}
+
+    def get_version_names(self):
+        if self.action in ('list', 'retrieve'):
+            sources = self.version_sources
+        else:
+            sources = self.action_version_sources.get(self.action)
+        if not sources:
+            return None
+        return sorted(source if isinstance(source, str) else table_version(source) for source in sources)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_validators = None
+        names = self.get_version_names() if request.method in ('GET', 'HEAD') else None
+        if not names:
+            return
+
+        versions = dict.fromkeys(names, (0, None))
+        versions.update(
+            (name, (version, updated_at))
+            for name, version, updated_at in DataVersion.objects.filter(name__in=names)
+            .values_list('name', 'version', 'updated_at')
+        )
+        tag = '|'.join([request.get_full_path(), *(f'{name}={version}' for name, (version, _) in versions.items())])
+        etag = quote_etag(hashlib.md5(tag.encode()).hexdigest())
+        timestamps = [updated_at for _, updated_at in versions.values() if updated_at]
+        last_modified = max(timestamps).timestamp() if timestamps else None
+        self.conditional_validators = (etag, last_modified)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            raise NotModified(not_modified)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'conditional_validators', None) and response.status_code in (200, 304):
+            etag, last_modified = self.conditional_validators
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Tarayıcı heuristik olarak cache'ten sunmasın: her seferinde doğrulasın
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,27 @@
+"""
+Veritabanı bağlantı ayarları.
+
+SQLite için her yeni bağlantıda WAL journal, synchronous=NORMAL ve
+busy_timeout uygulanır: okuyucular yazanı beklemez, eşzamanlı not girişinde
+yazma kilidi hemen "database is locked" hatası vermek yerine beklenir.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def sqlite_pragmas():
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}",
+    ]
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
@@ -0,0 +1,51 @@
+"""
+Dependency index for materialized PO scores: PO ← LO ← Assessment ← Grade.
+
+Each function maps one changed row to the (student × PO) cells whose score
+can change, following the mapping edges instead of recomputing the whole
+cohort. An LO→PO edge only reaches students graded in that LO's course;
+a grade only reaches its own student.
+"""
+from .models import Grade, LoToPoMapping
+
+
+def _assessment_students(assessment_id):
+    return Grade.objects.filter(assessment_id=assessment_id).order_by().values_list('student_id', flat=True)
+
+
+def _assessment_program_outcomes(assessment_id):
+    """Assessment → LO → PO yoluyla ulaşılan PO'lar"""
+    return LoToPoMapping.objects.filter(
+        learning_outcome__assessment_mappings__assessment_id=assessment_id
+    ).order_by().values_list('program_outcome_id', flat=True).distinct()
+
+
+def grade_dependents(student_id, assessment_id):
+    return [student_id], _assessment_program_outcomes(assessment_id)
+
+
+def assessment_dependents(assessment_id):
+    """total_points yüzdeleri değiştirir: not almış öğrenciler × ulaşılan PO'lar"""
+    return _assessment_students(assessment_id), _assessment_program_outcomes(assessment_id)
+
+
+def assessment_mapping_dependents(assessment_id, learning_outcome_id):
+    student_ids = _assessment_students(assessment_id)
+    po_ids = LoToPoMapping.objects.filter(
+        learning_outcome_id=learning_outcome_id
+    ).order_by().values_list('program_outcome_id', flat=True)
+    return student_ids, po_ids
+
+
+def lo_mapping_dependents(learning_outcome_id, program_outcome_id):
+    student_ids = Grade.objects.filter(
+        assessment__lo_mappings__learning_outcome_id=learning_outcome_id
+    ).order_by().values_list('student_id', flat=True).distinct()
+    return student_ids, [program_outcome_id]
+
+
+def recompute_size(student_ids, program_outcome_ids):
+    """Yeniden hesaplanacak küme boyutu (API yanıtları için)"""
+    students = len(set(student_ids))
+    program_outcomes = len(set(program_outcome_ids))
+    return {'students': students, 'program_outcomes': program_outcomes, 'cells': students * program_outcomes}
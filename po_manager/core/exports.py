@@ -0,0 +1,68 @@
+"""
+Streaming CSV export'ları.
+
+Satırlar `.iterator(chunk_size=...)` ile veritabanından parça parça okunur ve
+StreamingHttpResponse ile hemen gönderilir; sonuç kümesi hiçbir zaman
+tamamen belleğe alınmaz.
+"""
+import csv
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+
+from .models import ProgramOutcome
+from .scoring import materialized_po_scores_bulk
+
+EXPORT_CHUNK_SIZE = 2000
+PO_SCORE_EXPORT_BATCH = 500
+
+
+class Echo:
+    """csv.writer için yazılanı geri döndüren sahte dosya"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(filename, header, rows):
+    writer = csv.writer(Echo())
+
+    def generate():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def grade_rows(grades):
+    for student_no, course_code, assessment_name, points, total_points in grades.values_list(
+        'student__student_no', 'assessment__course__code', 'assessment__name',
+        'points', 'assessment__total_points',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        percentage = (points / total_points) * 100 if total_points > 0 else 0
+        yield [student_no, course_code, assessment_name, points, total_points, round(percentage, 2)]
+
+
+def export_grades(grades):
+    return stream_csv(
+        'grades.csv',
+        ['student_no', 'course', 'assessment', 'points', 'total_points', 'percentage'],
+        grade_rows(grades),
+    )
+
+
+def po_score_rows(students):
+    """Her satır: öğrenci no + PO başına skor; PO skorları batch'ler halinde okunur"""
+    students = students.values_list('id', 'student_no').iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    while batch := list(islice(students, PO_SCORE_EXPORT_BATCH)):
+        scores = materialized_po_scores_bulk(s_id for s_id, _ in batch)
+        for s_id, student_no in batch:
+            yield [student_no] + [cell['score'] for cell in scores[s_id]]
+
+
+def export_po_scores(students):
+    po_codes = list(ProgramOutcome.objects.values_list('code', flat=True))
+    return stream_csv('po_scores.csv', ['student_no'] + po_codes, po_score_rows(students))
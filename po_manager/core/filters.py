@@ -0,0 +1,24 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class QueryParamFilterBackend(BaseFilterBackend):
+    """
+    ViewSet'teki `filter_params` sözlüğüne göre eşitlik filtreleri.
+    Örn: filter_params = {'course': 'assessment__course'} → ?course=3 veya ?course=3,4
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for param, lookup in getattr(view, 'filter_params', {}).items():
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                if ',' in value:
+                    queryset = queryset.filter(**{f'{lookup}__in': value.split(',')})
+                else:
+                    queryset = queryset.filter(**{lookup: value})
+            except (ValueError, DjangoValidationError):
+                raise ValidationError({param: f"Geçersiz değer: {value}"})
+        return queryset
@@ -0,0 +1,106 @@
+"""
+Toplu not girişi (POST /api/grades/bulk/).
+
+Satırlar (student_no, assessment, points) chunk'lar halinde işlenir: her chunk
+için öğrenci ve assessment'lar tek sorguyla çözülür, notlar
+`bulk_create(update_conflicts=True)` ile kendi transaction'ında upsert edilir.
+Hatalı satırlar atlanır ve raporlanır; batch'in geri kalanı yazılır.
+"""
+import csv
+import io
+import math
+from itertools import islice
+
+from django.db import transaction
+
+from .models import Student, Assessment, Grade
+from .signals import mark_grades_dirty
+
+BULK_CHUNK_SIZE = 500
+REQUIRED_COLUMNS = ('student_no', 'assessment', 'points')
+
+
+def read_csv_rows(uploaded_file):
+    """Yüklenen CSV dosyasını satır satır oku (dosya belleğe alınmaz)"""
+    text = io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    missing = [col for col in REQUIRED_COLUMNS if col not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV başlığında eksik kolon(lar): {', '.join(missing)}")
+    yield from reader
+
+
+def parse_points(value):
+    """Sonlu sayı; bool, 'nan', 'inf', '1e999' ValueError"""
+    if isinstance(value, bool):
+        raise ValueError(value)
+    points = float(value)
+    if not math.isfinite(points):
+        raise ValueError(value)
+    return points
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _import_chunk(chunk, first_row):
+    """Bir chunk'ı doğrula ve yaz; (kaydedilen sayısı, hata listesi) döndürür"""
+    errors = []
+    student_nos = {str(row.get('student_no', '')).strip() for row in chunk}
+    assessment_keys = {str(row.get('assessment', '')).strip() for row in chunk}
+    students = dict(Student.objects.filter(student_no__in=student_nos).values_list('student_no', 'id'))
+    assessment_ids = set(Assessment.objects.filter(
+        id__in=[key for key in assessment_keys if key.isdigit()]
+    ).values_list('id', flat=True))
+
+    # Aynı (öğrenci, assessment) chunk içinde tekrar ederse son satır geçerli
+    grades = {}
+    for row_no, row in enumerate(chunk, start=first_row):
+        student_no = str(row.get('student_no', '')).strip()
+        assessment = str(row.get('assessment', '')).strip()
+        if student_no not in students:
+            errors.append({'row': row_no, 'message': f"Öğrenci bulunamadı: {student_no}"})
+            continue
+        if not assessment.isdigit() or int(assessment) not in assessment_ids:
+            errors.append({'row': row_no, 'message': f"Assessment bulunamadı: {assessment}"})
+            continue
+        try:
+            points = parse_points(row.get('points'))
+        except (TypeError, ValueError):
+            errors.append({'row': row_no, 'message': f"Geçersiz puan: {row.get('points')}"})
+            continue
+        key = (students[student_no], int(assessment))
+        grades[key] = Grade(student_id=key[0], assessment_id=key[1], points=points)
+
+    with transaction.atomic():
+        Grade.objects.bulk_create(
+            grades.values(),
+            update_conflicts=True,
+            unique_fields=['assessment', 'student'],
+            update_fields=['points'],
+        )
+        mark_grades_dirty(grades.keys())
+    return len(grades), errors
+
+
+def import_grades(rows, chunk_size=BULK_CHUNK_SIZE):
+    """
+    `rows`: {'student_no', 'assessment', 'points'} sözlükleri (JSON dizisi veya CSV).
+    Satır numaraları 1'den başlar.
+    """
+    processed = saved = 0
+    errors = []
+    for chunk in _chunks(rows, chunk_size):
+        chunk_saved, chunk_errors = _import_chunk(chunk, processed + 1)
+        processed += len(chunk)
+        saved += chunk_saved
+        errors.extend(chunk_errors)
+    return {
+        'success': not errors,
+        'processed': processed,
+        'saved': saved,
+        'errors': errors,
+    }
@@ -0,0 +1,151 @@
+"""
+Chatbot için takılabilir LLM backend'leri.
+
+Backend `settings.LLM_BACKEND` ile seçilir ('gemini', 'fake' veya bir sınıfın
+dotted path'i) ve process boyunca tek bir örnek olarak tekrar kullanılır.
+`generate()` / `generate_stream()` eşzamanlılık limiti (LLM_MAX_CONCURRENCY)
+ve zaman aşımı (LLM_TIMEOUT) altında çalışır.
+"""
+import asyncio
+import weakref
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+class LLMTimeout(Exception):
+    """LLM yanıtı LLM_TIMEOUT içinde gelmedi"""
+
+
+class LLMBackend:
+    """LLM backend arayüzü"""
+
+    async def complete(self, prompt):
+        """Prompt'un tam yanıtını döndür"""
+        raise NotImplementedError
+
+    async def stream(self, prompt):
+        """Yanıtı model ürettikçe parça parça ver; varsayılan: tek parça"""
+        yield await self.complete(prompt)
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini; istemci bir kez yapılandırılır ve tekrar kullanılır"""
+
+    def __init__(self):
+        if not settings.GEMINI_API_KEY:
+            raise ImproperlyConfigured("LLM_BACKEND='gemini' için GEMINI_API_KEY ortam değişkeni gerekli")
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
+
+    async def complete(self, prompt):
+        # Senkron SDK çağrısı thread'de: event loop bloklanmaz, istemci her loop'ta çalışır
+        response = await asyncio.to_thread(
+            self.model.generate_content, prompt,
+            request_options={'timeout': settings.LLM_TIMEOUT},
+        )
+        return response.text
+
+    async def stream(self, prompt):
+        # Senkron stream iterator'ı thread'de tüketilir, parçalar kuyrukla loop'a aktarılır
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        end = object()
+
+        def produce():
+            try:
+                for chunk in self.model.generate_content(
+                    prompt, stream=True, request_options={'timeout': settings.LLM_TIMEOUT},
+                ):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk.text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, end)
+
+        producer = loop.run_in_executor(None, produce)
+        while (item := await queue.get()) is not end:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await producer
+
+
+class FakeBackend(LLMBackend):
+    """Ağ erişimi olmadan yük testi için sahte backend (LLM_FAKE_LATENCY kadar bekler)"""
+
+    def __init__(self):
+        self.latency = settings.LLM_FAKE_LATENCY
+
+    async def complete(self, prompt):
+        await asyncio.sleep(self.latency)
+        return f"[fake] Prompt {len(prompt)} karakter."
+
+    async def stream(self, prompt):
+        words = (await self.complete(prompt)).split(' ')
+        for i, word in enumerate(words):
+            yield word if i == 0 else ' ' + word
+
+
+BACKENDS = {
+    'gemini': GeminiBackend,
+    'fake': FakeBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    name = settings.LLM_BACKEND
+    backend_class = BACKENDS[name] if name in BACKENDS else import_string(name)
+    return backend_class()
+
+
+# asyncio.Semaphore tek bir event loop'a bağlıdır; WSGI altında her istek yeni loop açar
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    return _semaphores[loop]
+
+
+async def generate(prompt):
+    """Eşzamanlılık limiti ve zaman aşımı ile tam yanıt üret"""
+    async def limited():
+        async with _semaphore():
+            return await get_backend().complete(prompt)
+
+    try:
+        return await asyncio.wait_for(limited(), timeout=settings.LLM_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise LLMTimeout(f"LLM yanıtı {settings.LLM_TIMEOUT:g} saniyede gelmedi")
+
+
+async def generate_stream(prompt):
+    """
+    Yanıt parçalarını geldikçe ver. Semafor stream boyunca tutulur;
+    LLM_TIMEOUT hem sıra beklemeye hem de iki parça arasındaki süreye uygulanır.
+    """
+    semaphore = _semaphore()
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=settings.LLM_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise LLMTimeout(f"LLM sırası {settings.LLM_TIMEOUT:g} saniyede gelmedi")
+    try:
+        chunks = get_backend().stream(prompt)
+        while True:
+            try:
+                chunk = await asyncio.wait_for(anext(chunks), timeout=settings.LLM_TIMEOUT)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                raise LLMTimeout(f"LLM yanıtı {settings.LLM_TIMEOUT:g} saniyede gelmedi")
+            yield chunk
+    finally:
+        semaphore.release()
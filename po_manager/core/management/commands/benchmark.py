@@ -0,0 +1,109 @@
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.benchmarks import run_benchmarks, throwaway_database
+from core.models import Student
+from core.scoring import refresh_po_scores
+from core.synthetic import generate_dataset
+
+COMPARED = (('throughput_per_s', 1), ('p95_ms', -1), ('queries', -1), ('peak_memory_kb', -1))
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Geçici bir veritabanında sentetik veri üretip po_scores, get_all_po_stats, "
+        "grades/ listesi ve toplu not girişini ölçer; sonuçları JSON olarak yazar"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--courses', type=int, default=40)
+        parser.add_argument('--pos', type=int, default=10, help="Program outcome sayısı")
+        parser.add_argument('--los', type=int, default=4, help="Ders başına LO sayısı")
+        parser.add_argument('--assessments', type=int, default=4, help="Ders başına assessment sayısı")
+        parser.add_argument('--courses-per-student', type=int, default=6)
+        parser.add_argument('--departments', default='CSE,EEE,ME')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--bulk-rows', type=int, default=500, help="Toplu giriş isteği başına satır")
+        parser.add_argument('--output', help="Sonuç JSON dosyası")
+        parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç JSON dosyası")
+
+    def handle(self, *args, **options):
+        params = {
+            key: options[key] for key in (
+                'students', 'courses', 'pos', 'los', 'assessments', 'courses_per_student',
+                'departments', 'seed', 'iterations', 'bulk_rows',
+            )
+        }
+        baseline = self.load(options['compare']) if options['compare'] else None
+
+        with throwaway_database():
+            started = time.perf_counter()
+            dataset = generate_dataset(
+                students=options['students'], courses=options['courses'],
+                program_outcomes=options['pos'], los_per_course=options['los'],
+                assessments_per_course=options['assessments'],
+                courses_per_student=options['courses_per_student'],
+                departments=options['departments'].split(','), seed=options['seed'],
+            )
+            generated = time.perf_counter() - started
+            self.stdout.write(f"Veri üretildi ({generated:.1f}s): {dataset}")
+
+            started = time.perf_counter()
+            refresh_po_scores(Student.objects.values_list('id', flat=True))
+            rebuilt = time.perf_counter() - started
+
+            results = run_benchmarks(iterations=options['iterations'], bulk_rows=options['bulk_rows'])
+
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'git_commit': git_commit(),
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'params': params,
+                'dataset': dataset,
+                'setup_seconds': {'generate': round(generated, 2), 'rebuild_po_scores': round(rebuilt, 2)},
+            },
+            'results': results,
+        }
+        self.print_results(results, baseline)
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+            self.stdout.write(self.style.SUCCESS(f"✓ Sonuçlar yazıldı: {options['output']}"))
+
+    def load(self, path):
+        try:
+            return json.loads(Path(path).read_text())['results']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Karşılaştırma dosyası okunamadı: {e}")
+
+    def print_results(self, results, baseline):
+        for name, stats in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{name}"))
+            for key, value in stats.items():
+                line = f"  {key:<18} {value}"
+                previous = (baseline or {}).get(name, {}).get(key)
+                direction = dict(COMPARED).get(key)
+                if direction and previous:
+                    change = (value - previous) / previous * 100
+                    style = self.style.ERROR if change * direction < -5 else self.style.SUCCESS
+                    line += style(f"  ({change:+.1f}% / önceki {previous})")
+                self.stdout.write(line)
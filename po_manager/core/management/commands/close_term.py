@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.attainment import DEFAULT_THRESHOLD
+from core.terms import close_term
+
+
+class Command(BaseCommand):
+    help = "Dönemi kapatır: öğrenci PO ve ders LO/PO sonuçlarını değişmez arşive yazar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('semester', help="Course.semester değeri (örn: 2024-Fall)")
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Başarı eşiği")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            snapshot = close_term(options['semester'], options['threshold'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {snapshot.semester} kapatıldı: {snapshot.course_count} ders, "
+            f"{snapshot.student_count} öğrenci, {snapshot.student_scores.count()} PO skoru, "
+            f"{snapshot.course_outcomes.count()} ders özeti ({elapsed:.2f}s)"
+        ))
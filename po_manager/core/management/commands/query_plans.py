@@ -0,0 +1,104 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.benchmarks import throwaway_database
+from core.models import (
+    Course, LoToPoMapping, Student, Assessment, AssessmentToLoMapping, Grade
+)
+from core.synthetic import generate_dataset
+
+INDEXED_MODELS = [Course, LoToPoMapping, Student, Assessment, AssessmentToLoMapping, Grade]
+
+
+class RollbackPlans(Exception):
+    """'Önce' ölçümünden sonra index silmelerini geri almak için"""
+
+
+def access_path_queries():
+    """Skorlama ve rapor kodunun kullandığı sorgular (örnek id'lerle)"""
+    student = Student.objects.order_by('id').first()
+    grade = Grade.objects.order_by('id').first()
+    lo_map = LoToPoMapping.objects.order_by('id').first()
+    course = Course.objects.order_by('id').first()
+    if not (student and grade and lo_map and course):
+        raise CommandError("Sentetik veri boş; --students / --courses değerlerini artırın")
+
+    return [
+        ("Grade: öğrencinin notları", Grade.objects.filter(
+            student_id=student.id).order_by().values_list('assessment_id', 'points')),
+        ("Grade: (assessment, student)", Grade.objects.filter(
+            assessment_id=grade.assessment_id, student_id=grade.student_id).order_by().values_list('points')),
+        ("LoToPoMapping: PO'ya göre", LoToPoMapping.objects.filter(
+            program_outcome_id__in=[lo_map.program_outcome_id]
+        ).values_list('learning_outcome_id', 'program_outcome_id', 'contribution_weight')),
+        ("AssessmentToLoMapping: LO'ya göre", AssessmentToLoMapping.objects.filter(
+            learning_outcome_id=lo_map.learning_outcome_id
+        ).values_list('assessment_id', 'learning_outcome_id', 'contribution_weight')),
+        ("Course: dönem", Course.objects.filter(semester=course.semester)),
+        ("Course: bölüm + dönem", Course.objects.filter(
+            department=course.department, semester=course.semester)),
+        ("Assessment: ders, tarihe göre", Assessment.objects.filter(course_id=course.id)),
+        ("Student: bölüm", Student.objects.filter(department=student.department)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Skorlama/rapor sorgularının query plan'larını ve sürelerini Meta.indexes "
+        "ile tanımlı access-path index'leri olmadan ve ile karşılaştırır. Index'ler "
+        "silindiği için (PostgreSQL'de tabloyu ACCESS EXCLUSIVE kilitler) her zaman "
+        "sentetik veriyle doldurulan geçici bir test veritabanında çalışır; asıl "
+        "veritabanına dokunmaz"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help="Sorgu başına tekrar sayısı")
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--courses', type=int, default=40)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def measure(self, queries, repeat):
+        results = []
+        for label, queryset in queries:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            results.append((label, queryset.explain(), statistics.median(timings)))
+        return results
+
+    def compare(self, repeat):
+        """(index'siz, index'li) ölçümler; index silmeleri geri alınan transaction'da"""
+        queries = access_path_queries()
+        schema_editor = connection.schema_editor()
+
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for model in INDEXED_MODELS:
+                        for index in model._meta.indexes:
+                            cursor.execute(schema_editor.sql_delete_index % {
+                                'table': schema_editor.quote_name(model._meta.db_table),
+                                'name': schema_editor.quote_name(index.name),
+                            })
+                before = self.measure(queries, repeat)
+                raise RollbackPlans
+        except RollbackPlans:
+            pass
+        return before, self.measure(queries, repeat)
+
+    def handle(self, *args, **options):
+        with throwaway_database('po_manager_query_plans.sqlite3'):
+            generate_dataset(students=options['students'], courses=options['courses'], seed=options['seed'])
+            before, after = self.compare(options['repeat'])
+
+        for (label, plan_before, ms_before), (_, plan_after, ms_after) in zip(before, after):
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{label}"))
+            self.stdout.write(f"  Önce  ({ms_before:.3f} ms):")
+            self.stdout.write("    " + plan_before.replace("\n", "\n    "))
+            self.stdout.write(f"  Sonra ({ms_after:.3f} ms):")
+            self.stdout.write("    " + plan_after.replace("\n", "\n    "))
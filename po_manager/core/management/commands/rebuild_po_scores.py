@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.caching import MAPPING_GRAPH, PO_STATS, mark_changed
+from core.models import Student, StudentPoScore
+from core.scoring import COHORT_CHUNK_SIZE, refresh_po_scores
+
+
+class Command(BaseCommand):
+    help = "StudentPoScore tablosunu tüm öğrenciler için sıfırdan yeniden hesaplar"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=COHORT_CHUNK_SIZE,
+            help="Tek grade sorgusunda işlenecek öğrenci sayısı",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        student_ids = list(Student.objects.values_list('id', flat=True))
+
+        with transaction.atomic():
+            StudentPoScore.objects.all().delete()
+            written = refresh_po_scores(student_ids, chunk_size=options['chunk_size'])
+            # Skor ETag'leri, PO istatistikleri ve diğer worker'ların grafik cache'i (commit sonrası)
+            mark_changed(PO_STATS)
+            mark_changed(MAPPING_GRAPH)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {len(student_ids)} öğrenci için {written} PO skoru yazıldı ({elapsed:.2f}s)"
+        ))
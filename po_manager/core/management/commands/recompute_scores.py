@@ -0,0 +1,39 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.recompute import recompute_all
+from core.scoring import COHORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        "Tüm öğrencilerin PO skorlarını process havuzunda paralel yeniden hesaplar "
+        "(mapping ağırlıkları toplu değiştikten sonra)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Worker process sayısı (1: tek process, havuz yok)",
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=COHORT_CHUNK_SIZE,
+            help="Worker'a tek seferde verilen öğrenci sayısı",
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['chunk_size'] < 1:
+            raise CommandError("--workers ve --chunk-size en az 1 olmalı")
+
+        def progress(done, total, cells, elapsed):
+            self.stdout.write(
+                f"  {done}/{total} öğrenci ({done * 100 // total}%), {cells} hücre, "
+                f"{done / elapsed:,.0f} öğrenci/s"
+            )
+
+        students, cells, elapsed = recompute_all(options['workers'], options['chunk_size'], progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {students} öğrenci için {cells} PO skoru yazıldı ({elapsed:.2f}s, "
+            f"{students / elapsed if elapsed else 0:,.0f} öğrenci/s, {options['workers']} worker)"
+        ))
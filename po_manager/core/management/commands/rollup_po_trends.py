@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.analytics import refresh_term_rollups, term_key
+from core.models import Course, TermSnapshot
+
+
+class Command(BaseCommand):
+    help = "Açık dönemlerin (dönem, ders, PO) trend rollup'larını canlı verilerden yeniden yazar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', action='append', help="Sadece bu dönem(ler); tekrar verilebilir")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        closed = set(TermSnapshot.objects.values_list('semester', flat=True))
+        semesters = options['semester'] or Course.objects.exclude(semester='').values_list('semester', flat=True).distinct()
+
+        written = 0
+        for semester in sorted(set(semesters), key=term_key):
+            if semester in closed:
+                self.stdout.write(f"  {semester}: kapatılmış, atlandı")
+                continue
+            rows = refresh_term_rollups(semester)
+            written += rows
+            self.stdout.write(f"  {semester}: {rows} satır")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"✓ {written} rollup satırı yazıldı ({elapsed:.2f}s)"))
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from django.db.models import Max
+
+from core.models import Student
+from core.scoring import refresh_po_scores
+from core.synthetic import BATCH_SIZE, generate_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Deterministik sentetik veri üretir (bulk insert, şifre tek sefer hash'lenir) "
+        "ve yeni öğrencilerin PO skorlarını hesaplar. Yük testi için milyon notluk veri saniyeler sürer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--courses', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0, help="Aynı seed aynı veriyi üretir")
+        parser.add_argument('--pos', type=int, default=10, help="Program outcome sayısı")
+        parser.add_argument('--los', type=int, default=4, help="Ders başına LO sayısı")
+        parser.add_argument('--assessments', type=int, default=4, help="Ders başına assessment sayısı")
+        parser.add_argument('--courses-per-student', type=int, default=6)
+        parser.add_argument('--departments', default='CSE,EEE,ME')
+        parser.add_argument('--password', default='password123', help="Tüm öğrenci kullanıcılarının şifresi")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Transaction başına not satırı")
+        parser.add_argument('--skip-scores', action='store_true', help="StudentPoScore hesaplamasını atla")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        last_id = Student.objects.aggregate(last=Max('id'))['last'] or 0
+        try:
+            counts = generate_dataset(
+                students=options['students'], courses=options['courses'],
+                program_outcomes=options['pos'], los_per_course=options['los'],
+                assessments_per_course=options['assessments'],
+                courses_per_student=options['courses_per_student'],
+                departments=options['departments'].split(','), seed=options['seed'],
+                password=options['password'], batch_size=options['batch_size'],
+            )
+        except IntegrityError as e:
+            raise CommandError(f"Üretilen kodlar mevcut verilerle çakıştı: {e}")
+        self.stdout.write(
+            f"✓ {', '.join(f'{count} {name}' for name, count in counts.items())} "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+
+        if not options['skip_scores']:
+            started = time.perf_counter()
+            new_students = Student.objects.filter(id__gt=last_id).values_list('id', flat=True)
+            written = refresh_po_scores(new_students)
+            self.stdout.write(f"✓ {written} PO skoru yazıldı ({time.perf_counter() - started:.1f}s)")
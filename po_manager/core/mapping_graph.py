@@ -0,0 +1,78 @@
+"""
+Mapping editörü için toplu kaydetme (PUT /api/courses/{id}/mapping-graph/).
+
+Gelen edge kümesi dersin mevcut LO→PO ve Assessment→LO edge'leriyle
+karşılaştırılır; farklar tek transaction'da bulk_create / bulk_update /
+delete ile uygulanır. Etkilenen hücreler (dersten not almış öğrenciler ×
+eski ve yeni edge'lerin PO'ları) bir kez işaretlenir, böylece kayıt başına
+tek yeniden hesaplama yapılır.
+"""
+from django.db import transaction
+
+from .caching import MAPPING_GRAPH, PO_STATS, mark_changed, mark_tables_changed
+from .dependencies import recompute_size
+from .models import Grade, LoToPoMapping, AssessmentToLoMapping
+from .signals import mark_dirty
+
+
+def course_mappings(course):
+    """Dersin (LO→PO, Assessment→LO) mapping querysets'i"""
+    return (
+        LoToPoMapping.objects.filter(learning_outcome__course=course)
+        .select_related('learning_outcome', 'program_outcome').order_by('id'),
+        AssessmentToLoMapping.objects.filter(assessment__course=course)
+        .select_related('assessment', 'learning_outcome').order_by('id'),
+    )
+
+
+def _sync(queryset, key_fields, edges):
+    """Mevcut satırları edge listesine eşitle; {created, updated, deleted} döndürür"""
+    model = queryset.model
+    current = {
+        tuple(getattr(mapping, f'{field}_id') for field in key_fields): mapping
+        for mapping in queryset.select_for_update()
+    }
+    desired = {tuple(edge[field] for field in key_fields): edge['contribution_weight'] for edge in edges}
+
+    created = [
+        model(**{f'{field}_id': value for field, value in zip(key_fields, key)}, contribution_weight=weight)
+        for key, weight in desired.items() if key not in current
+    ]
+    updated = []
+    for key, weight in desired.items():
+        mapping = current.get(key)
+        if mapping is not None and mapping.contribution_weight != weight:
+            mapping.contribution_weight = weight
+            updated.append(mapping)
+    deleted = [mapping.id for key, mapping in current.items() if key not in desired]
+
+    model.objects.bulk_create(created)
+    model.objects.bulk_update(updated, ['contribution_weight'])
+    if deleted:
+        model.objects.filter(id__in=deleted).delete()
+    return {'created': len(created), 'updated': len(updated), 'deleted': len(deleted)}
+
+
+@transaction.atomic
+def apply_mapping_graph(course, lo_po, assessment_lo):
+    """Doğrulanmış edge kümesini uygula; değişiklik sayıları ve yeniden hesaplama boyutu döndürür"""
+    lo_po_mappings, assessment_lo_mappings = course_mappings(course)
+    old_po_ids = set(lo_po_mappings.values_list('program_outcome_id', flat=True))
+
+    changes = {
+        'lo_po': _sync(lo_po_mappings, ('learning_outcome', 'program_outcome'), lo_po),
+        'assessment_lo': _sync(assessment_lo_mappings, ('assessment', 'learning_outcome'), assessment_lo),
+    }
+    student_ids, po_ids = [], []
+    if any(any(counts.values()) for counts in changes.values()):
+        # bulk_create/bulk_update signal göndermez: etkilenen hücreler burada bir kez işaretlenir
+        student_ids = list(
+            Grade.objects.filter(assessment__course=course).order_by().values_list('student_id', flat=True).distinct()
+        )
+        po_ids = old_po_ids | {edge['program_outcome'] for edge in lo_po}
+        mark_changed(MAPPING_GRAPH)
+        mark_tables_changed(LoToPoMapping, AssessmentToLoMapping)
+        mark_dirty(student_ids, po_ids)
+        mark_changed(PO_STATS)
+
+    return {'changes': changes, 'recompute': recompute_size(student_ids, po_ids)}
@@ -0,0 +1,200 @@
+"""
+Request metrics for the API (optional, `API_METRICS=1`).
+
+`MetricsMiddleware` records per-request wall time, DB query count, DB time
+and response size, keyed by the resolved route name (e.g.
+`student-po-scores`). Each response gets a `Server-Timing` header; the
+aggregates are served by `/api/_metrics` in Prometheus text format as
+cumulative histograms (`_bucket{le=...}`, `_sum`, `_count`), so quantiles
+are computed on the Prometheus side with `histogram_quantile()` and can be
+aggregated across processes.
+
+Metrics are process-local: behind `--workers N` a scrape is answered by a
+single worker and only contains that worker's requests. Scrape every
+process separately (one port per worker) or run a single worker when the
+numbers matter.
+"""
+import bisect
+import contextvars
+import math
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# Histogram bucket üst sınırları (le); son bucket +Inf
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS = {
+    'duration': SECONDS_BUCKETS,
+    'db_queries': (1, 2, 5, 10, 20, 50, 100, 200, 500),
+    'db_duration': SECONDS_BUCKETS,
+    'response_size': (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000),
+}
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrapper: aktif isteğin sorgu sayısı ve süresine ekle"""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RouteMetrics:
+    """Bir route için process ömrü boyunca toplamlar ve histogram bucket sayıları"""
+
+    FIELDS = tuple(BUCKETS)
+
+    def __init__(self):
+        self.statuses = defaultdict(int)
+        self.counts = dict.fromkeys(self.FIELDS, 0)
+        self.sums = dict.fromkeys(self.FIELDS, 0.0)
+        # Kümülatif değil: bucket başına örnek sayısı, son eleman +Inf
+        self.buckets = {field: [0] * (len(BUCKETS[field]) + 1) for field in self.FIELDS}
+
+    def add(self, status_code, values):
+        self.statuses[status_code] += 1
+        for field, value in values.items():
+            if value is not None:
+                self.counts[field] += 1
+                self.sums[field] += value
+                self.buckets[field][bisect.bisect_left(BUCKETS[field], value)] += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = defaultdict(RouteMetrics)
+
+    def record(self, route, method, status_code, values):
+        with self.lock:
+            self.routes[(route, method)].add(status_code, values)
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+    def render(self):
+        """Prometheus text exposition formatı (histogram: _bucket + _sum + _count)"""
+        metrics = [
+            ('duration', 'po_manager_request_duration_seconds', "Request wall time"),
+            ('db_queries', 'po_manager_request_db_queries', "DB queries per request"),
+            ('db_duration', 'po_manager_request_db_duration_seconds', "DB time per request"),
+            ('response_size', 'po_manager_response_size_bytes', "Response body size"),
+        ]
+        with self.lock:
+            routes = sorted(self.routes.items())
+            lines = [
+                "# HELP po_manager_requests_total Requests by route, method and status",
+                "# TYPE po_manager_requests_total counter",
+            ]
+            for (route, method), m in routes:
+                for status_code, count in sorted(m.statuses.items()):
+                    lines.append(
+                        f'po_manager_requests_total{{{labels(route, method)},status="{status_code}"}} {count}'
+                    )
+            for field, name, help_text in metrics:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (route, method), m in routes:
+                    if not m.counts[field]:
+                        continue
+                    cumulative = 0
+                    for le, count in zip((*BUCKETS[field], '+Inf'), m.buckets[field]):
+                        cumulative += count
+                        le = le if le == '+Inf' else f'{le:g}'
+                        lines.append(f'{name}_bucket{{{labels(route, method)},le="{le}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{labels(route, method)}}} {m.sums[field]:g}')
+                    lines.append(f'{name}_count{{{labels(route, method)}}} {m.counts[field]}')
+        return "\n".join(lines) + "\n"
+
+
+def labels(route, method):
+    route = route.replace('\\', '\\\\').replace('"', '\\"')
+    return f'route="{route}",method="{method}"'
+
+
+def quantile(sorted_samples, q):
+    """Nearest-rank quantile (benchmark raporları)"""
+    index = max(0, math.ceil(q * len(sorted_samples)) - 1)
+    return sorted_samples[index]
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Route başına süre / sorgu / yanıt boyutu ölçümü ve Server-Timing header'ı"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder, dispatch_uid='core.metrics')
+        for connection in connections.all():
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats):
+        duration = time.perf_counter() - stats.started
+        match = request.resolver_match
+        route = match.view_name if match else 'unresolved'
+        # Streaming yanıtların boyutu gönderilmeden bilinmez
+        size = None if response.streaming else len(response.content)
+
+        registry.record(route, request.method, response.status_code, {
+            'duration': duration,
+            'db_queries': stats.queries,
+            'db_duration': stats.db_time,
+            'response_size': size,
+        })
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"'
+        )
+        return response
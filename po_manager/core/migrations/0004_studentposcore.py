@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_userprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentPoScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weighted_sum', models.FloatField(default=0.0, help_text='Σ yüzde × (Assess→LO) × (LO→PO)')),
+                ('weight_sum', models.FloatField(default=0.0, help_text='Σ (Assess→LO) × (LO→PO)')),
+                ('score', models.FloatField(default=0.0, help_text='weighted_sum / weight_sum (0-100)')),
+                ('program_outcome', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_scores', to='core.programoutcome')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='po_score_cells', to='core.student')),
+            ],
+            options={
+                'verbose_name': 'Student PO Score',
+                'verbose_name_plural': 'Student PO Scores',
+                'ordering': ['student', 'program_outcome'],
+                'unique_together': {('student', 'program_outcome')},
+            },
+        ),
+    ]
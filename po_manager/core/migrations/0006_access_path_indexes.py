@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_dataversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['course', 'date'], name='assessment_course_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessmenttolomapping',
+            index=models.Index(fields=['learning_outcome', 'assessment', 'contribution_weight'], name='alo_lo_assess_weight_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['department', 'semester'], name='course_dept_semester_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['semester'], name='course_semester_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['student', 'assessment', 'points'], name='grade_student_assess_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lotopomapping',
+            index=models.Index(fields=['program_outcome', 'learning_outcome', 'contribution_weight'], name='lopo_po_lo_weight_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['department', 'student_no'], name='student_dept_no_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_access_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(max_length=20, unique=True)),
+                ('closed_at', models.DateTimeField(auto_now_add=True)),
+                ('threshold', models.FloatField(help_text='Başarı eşiği (course outcome özetleri için)')),
+                ('course_count', models.PositiveIntegerField(default=0)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('closed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-closed_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentPoSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_no', models.CharField(max_length=20)),
+                ('department', models.CharField(max_length=100)),
+                ('po_code', models.CharField(max_length=8)),
+                ('score', models.FloatField()),
+                ('program_outcome', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.programoutcome')),
+                ('student', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.student')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_scores', to='core.termsnapshot')),
+            ],
+            options={
+                'ordering': ['snapshot', 'student_no', 'po_code'],
+                'indexes': [models.Index(fields=['snapshot', 'student_no', 'po_code'], name='student_po_snap_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseOutcomeSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_code', models.CharField(max_length=16)),
+                ('department', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('lo', 'Learning Outcome'), ('po', 'Program Outcome')], max_length=2)),
+                ('outcome_code', models.CharField(max_length=16)),
+                ('description', models.TextField()),
+                ('students', models.PositiveIntegerField()),
+                ('average', models.FloatField()),
+                ('above_threshold_percent', models.FloatField()),
+                ('distribution', models.JSONField(default=dict)),
+                ('course', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.course')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_outcomes', to='core.termsnapshot')),
+            ],
+            options={
+                'ordering': ['snapshot', 'course_code', 'kind', 'outcome_code'],
+                'indexes': [models.Index(fields=['snapshot', 'course_code'], name='course_outcome_snap_idx')],
+            },
+        ),
+    ]
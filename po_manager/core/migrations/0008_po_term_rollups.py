@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_term_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PoTermRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(max_length=20)),
+                ('course_code', models.CharField(max_length=16)),
+                ('department', models.CharField(max_length=100)),
+                ('po_code', models.CharField(max_length=8)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.course')),
+                ('program_outcome', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.programoutcome')),
+            ],
+            options={
+                'ordering': ['semester', 'course_code', 'po_code'],
+                'indexes': [models.Index(fields=['department', 'semester'], name='po_rollup_dept_semester_idx')],
+                'unique_together': {('semester', 'course_code', 'po_code')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_po_term_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataversion',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Son artırılma zamanı (Last-Modified)'),
+        ),
+    ]
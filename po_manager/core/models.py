@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 # Create your models here.
@@ -38,6 +39,11 @@ class Course(models.Model):
     
     class Meta:
         ordering = ['code']
+        indexes = [
+            # Rapor filtreleri: ?department=&semester= ve ?semester=
+            models.Index(fields=['department', 'semester'], name='course_dept_semester_idx'),
+            models.Index(fields=['semester'], name='course_semester_idx'),
+        ]
 
 
 class ProgramOutcome(models.Model):
@@ -78,6 +84,13 @@ class LoToPoMapping(models.Model):
     
     class Meta:
         unique_together = ['learning_outcome', 'program_outcome']
+        indexes = [
+            # PO → LO kenarları (ağırlıkla birlikte, index-only okuma)
+            models.Index(
+                fields=['program_outcome', 'learning_outcome', 'contribution_weight'],
+                name='lopo_po_lo_weight_idx',
+            ),
+        ]
         verbose_name = "LO to PO Mapping"
         verbose_name_plural = "LO to PO Mappings"
 
@@ -93,6 +106,9 @@ class Student(models.Model):
     
     class Meta:
         ordering = ['student_no']
+        indexes = [
+            models.Index(fields=['department', 'student_no'], name='student_dept_no_idx'),
+        ]
 
 
 class Assessment(models.Model):
@@ -117,6 +133,9 @@ class Assessment(models.Model):
     
     class Meta:
         ordering = ['course', 'date']
+        indexes = [
+            models.Index(fields=['course', 'date'], name='assessment_course_date_idx'),
+        ]
 
 
 class AssessmentToLoMapping(models.Model):
@@ -130,6 +149,13 @@ class AssessmentToLoMapping(models.Model):
     
     class Meta:
         unique_together = ['assessment', 'learning_outcome']
+        indexes = [
+            # LO → assessment kenarları (ağırlıkla birlikte, index-only okuma)
+            models.Index(
+                fields=['learning_outcome', 'assessment', 'contribution_weight'],
+                name='alo_lo_assess_weight_idx',
+            ),
+        ]
         verbose_name = "Assessment to LO Mapping"
         verbose_name_plural = "Assessment to LO Mappings"
 
@@ -146,6 +172,10 @@ class Grade(models.Model):
     class Meta:
         unique_together = ['assessment', 'student']
         ordering = ['assessment', 'student']
+        indexes = [
+            # Öğrenci bazlı taramalar (skorlama): (student) → (assessment, points) index-only
+            models.Index(fields=['student', 'assessment', 'points'], name='grade_student_assess_idx'),
+        ]
     
     @property
     def percentage(self):
@@ -153,3 +183,129 @@ class Grade(models.Model):
         if self.assessment.total_points > 0:
             return (self.points / self.assessment.total_points) * 100
         return 0
+
+
+class StudentPoScore(models.Model):
+    """Öğrencinin PO skoru - Grade/mapping değişikliklerinde güncellenen hazır tablo"""
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='po_score_cells')
+    program_outcome = models.ForeignKey(ProgramOutcome, on_delete=models.CASCADE, related_name='student_scores')
+    weighted_sum = models.FloatField(default=0.0, help_text="Σ yüzde × (Assess→LO) × (LO→PO)")
+    weight_sum = models.FloatField(default=0.0, help_text="Σ (Assess→LO) × (LO→PO)")
+    score = models.FloatField(default=0.0, help_text="weighted_sum / weight_sum (0-100)")
+    
+    def __str__(self):
+        return f"{self.student.student_no} - {self.program_outcome.code}: {self.score:.2f}"
+    
+    class Meta:
+        unique_together = ['student', 'program_outcome']
+        ordering = ['student', 'program_outcome']
+        verbose_name = "Student PO Score"
+        verbose_name_plural = "Student PO Scores"
+
+
+class DataVersion(models.Model):
+    """
+    Cache invalidation için veri versiyon sayacı (örn: 'po_stats').
+    İlgili tablolar değiştikçe artırılır; cache key'leri versiyonu içerir.
+    """
+    name = models.CharField(max_length=64, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now, help_text="Son artırılma zamanı (Last-Modified)")
+    
+    def __str__(self):
+        return f"{self.name}: v{self.version}"
+
+
+class TermSnapshot(models.Model):
+    """
+    Kapatılmış dönem (Course.semester) - dönem sonu PO/LO sonuçlarının değişmez arşivi.
+    Sonradan yapılan not/ağırlık değişiklikleri arşivlenmiş sonuçları etkilemez.
+    """
+    semester = models.CharField(max_length=20, unique=True)
+    closed_at = models.DateTimeField(auto_now_add=True)
+    closed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    threshold = models.FloatField(help_text="Başarı eşiği (course outcome özetleri için)")
+    course_count = models.PositiveIntegerField(default=0)
+    student_count = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.semester} ({self.closed_at:%Y-%m-%d})"
+    
+    class Meta:
+        ordering = ['-closed_at']
+
+
+class StudentPoSnapshot(models.Model):
+    """Öğrencinin dönem PO skoru (sadece o dönemin dersleri üzerinden)"""
+    snapshot = models.ForeignKey(TermSnapshot, on_delete=models.CASCADE, related_name='student_scores')
+    # Öğrenci / PO silinse de arşiv okunabilir kalsın: kod alanları kopyalanır
+    student = models.ForeignKey(Student, on_delete=models.SET_NULL, null=True, related_name='+')
+    student_no = models.CharField(max_length=20)
+    department = models.CharField(max_length=100)
+    program_outcome = models.ForeignKey(ProgramOutcome, on_delete=models.SET_NULL, null=True, related_name='+')
+    po_code = models.CharField(max_length=8)
+    score = models.FloatField()
+    
+    def __str__(self):
+        return f"{self.snapshot.semester} {self.student_no} - {self.po_code}: {self.score:.2f}"
+    
+    class Meta:
+        ordering = ['snapshot', 'student_no', 'po_code']
+        indexes = [
+            models.Index(fields=['snapshot', 'student_no', 'po_code'], name='student_po_snap_idx'),
+        ]
+
+
+class CourseOutcomeSnapshot(models.Model):
+    """Dersin dönem sonu LO / PO özeti (GET /api/courses/{id}/attainment/ satırı)"""
+    KINDS = [
+        ('lo', 'Learning Outcome'),
+        ('po', 'Program Outcome'),
+    ]
+    
+    snapshot = models.ForeignKey(TermSnapshot, on_delete=models.CASCADE, related_name='course_outcomes')
+    course = models.ForeignKey(Course, on_delete=models.SET_NULL, null=True, related_name='+')
+    course_code = models.CharField(max_length=16)
+    department = models.CharField(max_length=100)
+    kind = models.CharField(max_length=2, choices=KINDS)
+    outcome_code = models.CharField(max_length=16)
+    description = models.TextField()
+    students = models.PositiveIntegerField()
+    average = models.FloatField()
+    above_threshold_percent = models.FloatField()
+    distribution = models.JSONField(default=dict)
+    
+    def __str__(self):
+        return f"{self.snapshot.semester} {self.course_code} {self.outcome_code}: {self.average:.2f}"
+    
+    class Meta:
+        ordering = ['snapshot', 'course_code', 'kind', 'outcome_code']
+        indexes = [
+            models.Index(fields=['snapshot', 'course_code'], name='course_outcome_snap_idx'),
+        ]
+
+
+class PoTermRollup(models.Model):
+    """
+    (dönem, ders, PO) başına öğrenci PO skorlarının toplamı ve sayısı.
+    Trend raporları bu satırları toplar: ortalama = Σ score_sum / Σ student_count.
+    """
+    semester = models.CharField(max_length=20)
+    course = models.ForeignKey(Course, on_delete=models.SET_NULL, null=True, related_name='+')
+    course_code = models.CharField(max_length=16)
+    department = models.CharField(max_length=100)
+    program_outcome = models.ForeignKey(ProgramOutcome, on_delete=models.SET_NULL, null=True, related_name='+')
+    po_code = models.CharField(max_length=8)
+    score_sum = models.FloatField(default=0.0)
+    student_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.semester} {self.course_code} {self.po_code}: {self.score_sum:.1f}/{self.student_count}"
+    
+    class Meta:
+        unique_together = ['semester', 'course_code', 'po_code']
+        ordering = ['semester', 'course_code', 'po_code']
+        indexes = [
+            models.Index(fields=['department', 'semester'], name='po_rollup_dept_semester_idx'),
+        ]
@@ -0,0 +1,19 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Tüm list endpoint'leri için varsayılan cursor sayfalama (?cursor=, ?page_size=).
+    Sıralama ViewSet'in `ordering` alanından (OrderingFilter) gelir; yoksa id.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = 'id'
+
+
+class PoScorePagination(PageNumberPagination):
+    """Toplu PO skor endpoint'i için sayfalama (?page=, ?page_size=)"""
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
@@ -0,0 +1,67 @@
+"""
+Tüm öğrencilerin PO skorlarını paralel yeniden hesaplama (`manage.py recompute_scores`).
+
+Mapping grafiği ana process'te bir kez yüklenir ve pickle'lanarak her
+worker'a başlangıçta bir kez gönderilir. Öğrenciler chunk'lara bölünür;
+her worker kendi bağlantısıyla chunk'ın notlarını okur, skorları hesaplar
+ve StudentPoScore'a toplu upsert eder (core/recompute_worker.py). Ana
+process sadece ilerlemeyi izler.
+
+Worker'lar `spawn` ile başlatılır: fork'ta ana process'in açık veritabanı
+bağlantıları (ve psycopg pool'u) paylaşılırdı.
+"""
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.db import connection, connections
+
+from .caching import MAPPING_GRAPH, PO_STATS, mark_changed
+from .models import Student
+from .recompute_worker import init_worker, recompute_chunk
+from .scoring import COHORT_CHUNK_SIZE, MappingGraph, score_chunk, upsert_scores
+
+
+def recompute_all(workers=1, chunk_size=COHORT_CHUNK_SIZE, progress=None):
+    """
+    Tüm öğrencilerin StudentPoScore hücrelerini yeniden yaz.
+    `progress(students_done, total, cells_written, elapsed)` her chunk sonrası çağrılır.
+    Returns (students, cells, elapsed_seconds).
+    """
+    started = time.perf_counter()
+    # Cache'ten değil: ağırlıklar signal'sız (queryset.update) değişmiş olabilir
+    graph = MappingGraph.load()
+    student_ids = list(Student.objects.order_by('id').values_list('id', flat=True))
+    chunks = [student_ids[i:i + chunk_size] for i in range(0, len(student_ids), chunk_size)]
+    if not graph.program_outcomes:
+        chunks = []
+    done = written = 0
+
+    def report(students, cells):
+        nonlocal done, written
+        done += students
+        written += cells
+        if progress:
+            progress(done, len(student_ids), written, time.perf_counter() - started)
+
+    if workers <= 1:
+        for chunk in chunks:
+            weighted, weight_sums = score_chunk(chunk, graph)
+            report(len(chunk), upsert_scores(chunk, weighted, weight_sums, graph))
+    elif chunks:
+        graph_bytes = pickle.dumps(graph, protocol=pickle.HIGHEST_PROTOCOL)
+        database_name = connection.settings_dict['NAME']
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(graph_bytes, database_name),
+        ) as executor:
+            for future in as_completed([executor.submit(recompute_chunk, chunk) for chunk in chunks]):
+                report(*future.result())
+
+    mark_changed(PO_STATS)
+    mark_changed(MAPPING_GRAPH)
+    return len(student_ids), written, time.perf_counter() - started
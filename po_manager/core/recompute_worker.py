@@ -0,0 +1,26 @@
+"""
+`recompute_scores` worker process fonksiyonları.
+
+Spawn edilen process bu modülü Django kurulmadan import eder; bu yüzden
+model / skorlama importları fonksiyonların içinde, django.setup()'tan sonra.
+"""
+import pickle
+
+_graph = None
+
+
+def init_worker(graph_bytes, database_name):
+    global _graph
+    import django
+    django.setup()
+    from django.db import connections
+    # Ana process geçici / test veritabanındaysa worker'lar da aynısına bağlansın
+    connections['default'].settings_dict['NAME'] = database_name
+    _graph = pickle.loads(graph_bytes)
+
+
+def recompute_chunk(student_ids):
+    """Chunk'ı hesapla ve upsert et: (öğrenci sayısı, yazılan hücre)"""
+    from .scoring import score_chunk, upsert_scores
+    weighted, weight_sums = score_chunk(student_ids, _graph)
+    return len(student_ids), upsert_scores(student_ids, weighted, weight_sums, _graph)
@@ -0,0 +1,311 @@
+"""
+PO scoring engine.
+
+Compiles the Assessment → LO → PO mapping tables into NumPy weight matrices
+so PO scores can be computed with a constant number of queries, instead of
+one query per PO, LO and assessment.
+
+Formula (same as the original nested loop):
+    score(PO) = Σ percentage(a) * w(a→LO) * w(LO→PO) / Σ w(a→LO) * w(LO→PO)
+where the sums run over every assessment the student has a grade for.
+"""
+import numpy as np
+from django.db import connection, transaction
+
+from .caching import MAPPING_GRAPH, get_version
+from .models import (
+    ProgramOutcome, LoToPoMapping, AssessmentToLoMapping, Grade, Student, StudentPoScore
+)
+
+# Cohort hesaplamasında bir grade sorgusunda işlenen öğrenci sayısı.
+# Dense (students × assessments) matrisinin bellek kullanımını sınırlar.
+COHORT_CHUNK_SIZE = 1000
+
+# Process içi (MAPPING_GRAPH versiyonu, MappingGraph)
+_cached_graph = None
+
+
+class MappingGraph:
+    """
+    Assessment → PO weight matrix compiled from the mapping tables.
+
+    `weights[a, p]` is the sum over every LO path of
+    (Assessment→LO weight) * (LO→PO weight).
+    """
+
+    def __init__(self, program_outcomes, assessment_ids, total_points, weights):
+        self.program_outcomes = program_outcomes
+        self.assessment_ids = assessment_ids
+        self.assessment_index = {a_id: i for i, a_id in enumerate(assessment_ids)}
+        self.total_points = total_points
+        self.weights = weights
+
+    @classmethod
+    def load(cls, program_outcome_ids=None, courses=None):
+        """
+        Mapping grafiğini 3 sorgu ile yükle.
+        `program_outcome_ids` verilirse sadece o PO'ların alt grafiği yüklenir;
+        `courses` verilirse sadece o derslerin assessment'ları (diğer notlar yok sayılır).
+        """
+        pos = ProgramOutcome.objects.all()
+        lo_po = LoToPoMapping.objects.all()
+        assess_lo = AssessmentToLoMapping.objects.all()
+        if courses is not None:
+            lo_po = lo_po.filter(learning_outcome__course__in=courses)
+            assess_lo = assess_lo.filter(assessment__course__in=courses)
+        if program_outcome_ids is not None:
+            pos = pos.filter(id__in=program_outcome_ids)
+            lo_po = lo_po.filter(program_outcome_id__in=program_outcome_ids)
+            assess_lo = assess_lo.filter(
+                learning_outcome__po_mappings__program_outcome_id__in=program_outcome_ids
+            ).distinct()
+
+        program_outcomes = list(pos.values('id', 'code', 'description'))
+        po_index = {po['id']: i for i, po in enumerate(program_outcomes)}
+
+        lo_po_edges = list(lo_po.values_list(
+            'learning_outcome_id', 'program_outcome_id', 'contribution_weight'
+        ))
+        lo_index = {}
+        for lo_id, _, _ in lo_po_edges:
+            lo_index.setdefault(lo_id, len(lo_index))
+
+        # Sadece PO'ya bağlanan LO'lara giden assessment mapping'leri önemli
+        assess_lo_edges = [
+            edge for edge in assess_lo.values_list(
+                'assessment_id', 'learning_outcome_id', 'contribution_weight',
+                'assessment__total_points'
+            )
+            if edge[1] in lo_index
+        ]
+        assessment_ids = []
+        total_points = {}
+        for a_id, _, _, a_total in assess_lo_edges:
+            if a_id not in total_points:
+                assessment_ids.append(a_id)
+                total_points[a_id] = a_total
+        a_index = {a_id: i for i, a_id in enumerate(assessment_ids)}
+
+        assess_lo = np.zeros((len(assessment_ids), len(lo_index)))
+        for a_id, lo_id, weight, _ in assess_lo_edges:
+            assess_lo[a_index[a_id], lo_index[lo_id]] += weight
+
+        lo_po = np.zeros((len(lo_index), len(program_outcomes)))
+        for lo_id, po_id, weight in lo_po_edges:
+            lo_po[lo_index[lo_id], po_index[po_id]] += weight
+
+        return cls(
+            program_outcomes,
+            assessment_ids,
+            np.array([total_points[a_id] for a_id in assessment_ids], dtype=float),
+            assess_lo @ lo_po,
+        )
+
+    def subset(self, program_outcome_ids):
+        """Sadece verilen PO'ların kolonları (diğer PO'ların skorları aynı kalır)"""
+        program_outcome_ids = set(program_outcome_ids)
+        columns = [p for p, po in enumerate(self.program_outcomes) if po['id'] in program_outcome_ids]
+        return MappingGraph(
+            [self.program_outcomes[p] for p in columns],
+            self.assessment_ids,
+            self.total_points,
+            self.weights[:, columns],
+        )
+
+    def grade_matrices(self, grade_rows, n_rows):
+        """
+        Build (percentage, mask) matrices of shape (n_rows × assessments).
+
+        `grade_rows` yields (row_index, assessment_id, points) tuples; grades
+        for assessments that do not reach any PO are ignored.
+        """
+        percentages = np.zeros((n_rows, len(self.assessment_ids)))
+        mask = np.zeros((n_rows, len(self.assessment_ids)))
+        for row, a_id, points in grade_rows:
+            col = self.assessment_index.get(a_id)
+            if col is None:
+                continue
+            total = self.total_points[col]
+            percentages[row, col] = (points / total) * 100 if total > 0 else 0
+            mask[row, col] = 1.0
+        return percentages, mask
+
+    def score(self, percentages, mask):
+        """Return (weighted_sum, weight_sum) matrices of shape (rows × POs)."""
+        return percentages @ self.weights, mask @ self.weights
+
+
+def cached_graph():
+    """
+    Process içi MappingGraph cache'i: MAPPING_GRAPH versiyonu (1 sorgu) değişmedikçe
+    mapping tabloları yeniden okunmaz. Versiyon mapping / PO / assessment
+    signal'larıyla commit sonrası artırılır.
+
+    Transaction içinde commit edilmemiş (ve geri alınabilecek) değişiklikler
+    görülmeli; orada cache kullanılmadan yüklenir.
+    """
+    global _cached_graph
+    if connection.in_atomic_block:
+        return MappingGraph.load()
+    version = get_version(MAPPING_GRAPH)
+    if _cached_graph is None or _cached_graph[0] != version:
+        _cached_graph = (version, MappingGraph.load())
+    return _cached_graph[1]
+
+
+def normalize(weighted_sum, weight_sum):
+    """Toplam puan / toplam ağırlık; ağırlık yoksa 0"""
+    if weight_sum > 0:
+        return float(weighted_sum / weight_sum)
+    return 0
+
+
+def score_student(student, graph):
+    """Return (weighted_sum, weight_sum) vectors over POs for one student (1 query)."""
+    grade_rows = (
+        (0, a_id, points)
+        for a_id, points in Grade.objects.filter(student=student).order_by().values_list('assessment_id', 'points')
+    )
+    percentages, mask = graph.grade_matrices(grade_rows, 1)
+    weighted, weight_sums = graph.score(percentages, mask)
+    return weighted[0], weight_sums[0]
+
+
+def student_po_scores(student, graph=None):
+    """
+    Bir öğrencinin tüm PO skorları.
+    Returns the same list `StudentViewSet.po_scores` has always returned.
+    """
+    if graph is None:
+        graph = cached_graph()
+
+    weighted, weight_sums = score_student(student, graph)
+    return [
+        {
+            'po_code': po['code'],
+            'po_description': po['description'],
+            'score': round(normalize(weighted[p], weight_sums[p]), 2),
+        }
+        for p, po in enumerate(graph.program_outcomes)
+    ]
+
+
+def cohort_scores(students=None, graph=None, chunk_size=COHORT_CHUNK_SIZE):
+    """
+    Score a whole cohort in chunks of `chunk_size` students.
+
+    Yields (student_ids, weighted_sum, weight_sum) per chunk, where the two
+    matrices have shape (len(student_ids) × POs). Costs one query for the
+    student ids plus one grade query per chunk.
+    """
+    if graph is None:
+        graph = cached_graph()
+    if students is None:
+        students = Student.objects.all()
+
+    student_ids = list(students.values_list('id', flat=True))
+    for start in range(0, len(student_ids), chunk_size):
+        chunk = student_ids[start:start + chunk_size]
+        yield (chunk, *score_chunk(chunk, graph))
+
+
+def score_chunk(student_ids, graph):
+    """(weighted_sum, weight_sum) matrices for a list of student ids (1 query)."""
+    row_index = {s_id: i for i, s_id in enumerate(student_ids)}
+    grade_rows = (
+        (row_index[s_id], a_id, points)
+        for s_id, a_id, points in Grade.objects.filter(student_id__in=student_ids).order_by()
+        .values_list('student_id', 'assessment_id', 'points').iterator()
+    )
+    percentages, mask = graph.grade_matrices(grade_rows, len(student_ids))
+    return graph.score(percentages, mask)
+
+
+def upsert_scores(student_ids, weighted, weight_sums, graph):
+    """
+    Bir chunk'ın StudentPoScore hücrelerini toplu upsert et; yazılan hücre sayısı.
+    bulk_create(update_conflicts=True) yerine executemany: model örneği ve SQL
+    derleme maliyeti yok (SQLite ve PostgreSQL ikisi de ON CONFLICT destekler).
+    """
+    quote = connection.ops.quote_name
+    sql = (
+        f"INSERT INTO {quote(StudentPoScore._meta.db_table)} "
+        f"(student_id, program_outcome_id, weighted_sum, weight_sum, score) VALUES (%s, %s, %s, %s, %s) "
+        f"ON CONFLICT (student_id, program_outcome_id) DO UPDATE SET "
+        f"weighted_sum = excluded.weighted_sum, weight_sum = excluded.weight_sum, score = excluded.score"
+    )
+    po_ids = [po['id'] for po in graph.program_outcomes]
+    rows = [
+        (s_id, po_id, weighted_row[p], weight_row[p], normalize(weighted_row[p], weight_row[p]))
+        for s_id, weighted_row, weight_row in zip(student_ids, weighted.tolist(), weight_sums.tolist())
+        for p, po_id in enumerate(po_ids)
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+    return len(rows)
+
+
+def refresh_po_scores(student_ids, program_outcome_ids=None, chunk_size=COHORT_CHUNK_SIZE):
+    """
+    Recompute and upsert the materialized StudentPoScore cells of the given
+    students, optionally restricted to some POs. Students or POs that no
+    longer exist are skipped. Returns the number of cells written.
+    """
+    graph = cached_graph()
+    if program_outcome_ids is not None:
+        graph = graph.subset(program_outcome_ids)
+    if not graph.program_outcomes:
+        return 0
+
+    student_ids = list(student_ids)
+    written = 0
+    for start in range(0, len(student_ids), chunk_size):
+        students = Student.objects.filter(id__in=student_ids[start:start + chunk_size])
+        for chunk, weighted, weight_sums in cohort_scores(students, graph, chunk_size):
+            written += upsert_scores(chunk, weighted, weight_sums, graph)
+    return written
+
+
+def _load_cells(student_ids):
+    return {
+        (s_id, po_id): (weighted_sum, weight_sum)
+        for s_id, po_id, weighted_sum, weight_sum in StudentPoScore.objects.filter(
+            student_id__in=student_ids
+        ).order_by().values_list('student_id', 'program_outcome_id', 'weighted_sum', 'weight_sum')
+    }
+
+
+def materialized_po_scores_bulk(student_ids):
+    """
+    {student_id: po_scores listesi} — StudentPoScore tablosundan tek sorguyla okunur.
+    Eksik hücresi olan öğrenciler (yeni öğrenci/PO, henüz rebuild yapılmamış)
+    önce hesaplanıp yazılır.
+    """
+    student_ids = list(student_ids)
+    program_outcomes = list(ProgramOutcome.objects.values('id', 'code', 'description'))
+    cells = _load_cells(student_ids)
+
+    missing = [
+        s_id for s_id in student_ids
+        if any((s_id, po['id']) not in cells for po in program_outcomes)
+    ]
+    if missing:
+        refresh_po_scores(missing)
+        cells.update(_load_cells(missing))
+
+    return {
+        s_id: [
+            {
+                'po_code': po['code'],
+                'po_description': po['description'],
+                'score': round(normalize(*cells.get((s_id, po['id']), (0, 0))), 2),
+            }
+            for po in program_outcomes
+        ]
+        for s_id in student_ids
+    }
+
+
+def materialized_po_scores(student):
+    """`student_po_scores` çıktısını StudentPoScore tablosundan oku"""
+    return materialized_po_scores_bulk([student.id])[student.id]
@@ -3,10 +3,27 @@ from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from .models import (
     Course, ProgramOutcome, LearningOutcome, 
-    LoToPoMapping, Student, Assessment, AssessmentToLoMapping, Grade, UserProfile
+    LoToPoMapping, Student, Assessment, AssessmentToLoMapping, Grade,
+    UserProfile, TermSnapshot, StudentPoSnapshot, CourseOutcomeSnapshot
 )
 
 
+class SparseFieldsMixin:
+    """?fields=id,code ile GET isteklerinde sadece istenen alanları döndür"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        fields = request.query_params.get('fields')
+        if not fields:
+            return
+        requested = {name.strip() for name in fields.split(',')}
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """Kullanıcı profil serializer"""
     class Meta:
@@ -84,7 +101,7 @@ class RegisterSerializer(serializers.Serializer):
         return user
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Ders serializer"""
     instructor_name = serializers.CharField(source='instructor.get_full_name', read_only=True)
     
@@ -93,14 +110,14 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = ['id', 'code', 'name', 'semester', 'department', 'instructor', 'instructor_name']
 
 
-class ProgramOutcomeSerializer(serializers.ModelSerializer):
+class ProgramOutcomeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Program Outcome serializer"""
     class Meta:
         model = ProgramOutcome
         fields = ['id', 'code', 'description']
 
 
-class LearningOutcomeSerializer(serializers.ModelSerializer):
+class LearningOutcomeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Learning Outcome serializer"""
     course_code = serializers.CharField(source='course.code', read_only=True)
     
@@ -109,7 +126,7 @@ class LearningOutcomeSerializer(serializers.ModelSerializer):
         fields = ['id', 'course', 'course_code', 'code', 'description', 'weight']
 
 
-class LoToPoMappingSerializer(serializers.ModelSerializer):
+class LoToPoMappingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """LO to PO Mapping serializer"""
     lo_code = serializers.CharField(source='learning_outcome.code', read_only=True)
     po_code = serializers.CharField(source='program_outcome.code', read_only=True)
@@ -119,7 +136,7 @@ class LoToPoMappingSerializer(serializers.ModelSerializer):
         fields = ['id', 'learning_outcome', 'lo_code', 'program_outcome', 'po_code', 'contribution_weight']
 
 
-class AssessmentToLoMappingSerializer(serializers.ModelSerializer):
+class AssessmentToLoMappingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Assessment to LO Mapping serializer"""
     assessment_name = serializers.CharField(source='assessment.name', read_only=True)
     lo_code = serializers.CharField(source='learning_outcome.code', read_only=True)
@@ -129,7 +146,50 @@ class AssessmentToLoMappingSerializer(serializers.ModelSerializer):
         fields = ['id', 'assessment', 'assessment_name', 'learning_outcome', 'lo_code', 'contribution_weight']
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class LoPoEdgeSerializer(serializers.Serializer):
+    learning_outcome = serializers.IntegerField()
+    program_outcome = serializers.IntegerField()
+    contribution_weight = serializers.FloatField(default=1.0)
+
+
+class AssessmentLoEdgeSerializer(serializers.Serializer):
+    assessment = serializers.IntegerField()
+    learning_outcome = serializers.IntegerField()
+    contribution_weight = serializers.FloatField(default=0.0)
+
+
+class MappingGraphSerializer(serializers.Serializer):
+    """Dersin tüm LO→PO ve Assessment→LO edge kümesi (context: course)"""
+    lo_po = LoPoEdgeSerializer(many=True)
+    assessment_lo = AssessmentLoEdgeSerializer(many=True)
+    
+    def validate(self, data):
+        course = self.context['course']
+        lo_ids = set(course.learning_outcomes.values_list('id', flat=True))
+        assessment_ids = set(course.assessments.values_list('id', flat=True))
+        po_ids = set(ProgramOutcome.objects.values_list('id', flat=True))
+        
+        errors = {}
+        checks = {
+            'lo_po': (('learning_outcome', lo_ids), ('program_outcome', po_ids)),
+            'assessment_lo': (('assessment', assessment_ids), ('learning_outcome', lo_ids)),
+        }
+        for name, fields in checks.items():
+            seen = set()
+            for i, edge in enumerate(data[name]):
+                key = tuple(edge[field] for field, _ in fields)
+                invalid = [field for field, valid_ids in fields if edge[field] not in valid_ids]
+                if invalid:
+                    errors.setdefault(name, []).append(f"{i}: bu derse ait olmayan {', '.join(invalid)}")
+                elif key in seen:
+                    errors.setdefault(name, []).append(f"{i}: tekrarlanan edge {key}")
+                seen.add(key)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
+
+
+class StudentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Öğrenci serializer"""
     user = UserSerializer(read_only=True)
     
@@ -165,7 +225,7 @@ class StudentSerializer(serializers.ModelSerializer):
         return student
 
 
-class AssessmentSerializer(serializers.ModelSerializer):
+class AssessmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Değerlendirme serializer"""
     course_code = serializers.CharField(source='course.code', read_only=True)
     learning_outcome_codes = serializers.SerializerMethodField()
@@ -181,7 +241,7 @@ class AssessmentSerializer(serializers.ModelSerializer):
         return [lo.code for lo in obj.learning_outcomes.all()]
 
 
-class GradeSerializer(serializers.ModelSerializer):
+class GradeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Not serializer"""
     student_no = serializers.CharField(source='student.student_no', read_only=True)
     assessment_name = serializers.CharField(source='assessment.name', read_only=True)
@@ -206,3 +266,34 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             'id', 'code', 'name', 'semester', 'department', 
             'instructor', 'learning_outcomes', 'assessments'
         ]
+
+
+class TermSnapshotSerializer(serializers.ModelSerializer):
+    """Kapatılmış dönem özeti"""
+    closed_by_name = serializers.CharField(source='closed_by.username', read_only=True, default=None)
+    
+    class Meta:
+        model = TermSnapshot
+        fields = ['id', 'semester', 'closed_at', 'closed_by', 'closed_by_name', 'threshold', 'course_count', 'student_count']
+        read_only_fields = fields
+
+
+class StudentPoSnapshotSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Arşivlenmiş öğrenci PO skoru"""
+    semester = serializers.CharField(source='snapshot.semester', read_only=True)
+    
+    class Meta:
+        model = StudentPoSnapshot
+        fields = ['id', 'semester', 'student', 'student_no', 'department', 'program_outcome', 'po_code', 'score']
+
+
+class CourseOutcomeSnapshotSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Arşivlenmiş ders LO / PO özeti"""
+    semester = serializers.CharField(source='snapshot.semester', read_only=True)
+    
+    class Meta:
+        model = CourseOutcomeSnapshot
+        fields = [
+            'id', 'semester', 'course', 'course_code', 'department', 'kind', 'outcome_code',
+            'description', 'students', 'average', 'above_threshold_percent', 'distribution'
+        ]
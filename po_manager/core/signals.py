@@ -0,0 +1,218 @@
+"""
+Signal handlers keeping the materialized StudentPoScore table up to date.
+
+Every Grade / AssessmentToLoMapping / LoToPoMapping change (and every
+Assessment.total_points change) marks the (student, PO) cells it can
+affect, as resolved by the dependency index in `dependencies.py`. The
+cells are collected per thread and recomputed once the surrounding
+transaction commits, so cascading deletes and bulk edits inside
+`transaction.atomic()` trigger a single refresh.
+
+Affected cells are resolved in pre_save / pre_delete (old state) and
+post_save (new state): by the time post_delete runs, cascades may already
+have removed the rows the lookup needs.
+"""
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.contrib.auth.models import User
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .caching import (
+    MAPPING_GRAPH, PO_STATS, before_version_flush, flush_versions, mark_changed, table_version
+)
+from .dependencies import (
+    grade_dependents, assessment_dependents, assessment_mapping_dependents, lo_mapping_dependents
+)
+from .models import (
+    Grade, AssessmentToLoMapping, LoToPoMapping, ProgramOutcome, Assessment,
+    Course, LearningOutcome, Student, UserProfile
+)
+from .scoring import refresh_po_scores
+
+_state = threading.local()
+
+
+def _pending():
+    if not hasattr(_state, 'cells'):
+        _state.cells = defaultdict(set)
+    return _state.cells
+
+
+def mark_dirty(student_ids, program_outcome_ids, schedule=True):
+    """
+    (student × PO) hücrelerini commit sonrası yeniden hesaplanmak üzere işaretle.
+    `schedule=False` sadece kaydeder: autocommit modunda on_commit hemen çalışır,
+    pre_save'de bu, değişiklik yazılmadan önce hesaplamak demek olur.
+    """
+    program_outcome_ids = set(program_outcome_ids)
+    cells = _pending()
+    for student_id in student_ids:
+        cells[student_id] |= program_outcome_ids
+    if schedule:
+        transaction.on_commit(flush)
+
+
+def flush():
+    """Bekleyen hücreleri yeniden hesapla; aynı PO kümesine sahip öğrenciler tek seferde"""
+    cells = _pending()
+    if not cells:
+        return
+    # Aynı commit'teki mapping değişikliği grafik versiyonunu önce artırmalı,
+    # yoksa refresh process içi cache'teki eski grafiği kullanır (on_commit sırası).
+    # po_stats ve tablo sayaçları ise hücreler yazıldıktan sonra.
+    flush_versions(MAPPING_GRAPH)
+    groups = defaultdict(list)
+    for student_id, po_ids in cells.items():
+        if po_ids:
+            groups[frozenset(po_ids)].append(student_id)
+    cells.clear()
+    for po_ids, student_ids in groups.items():
+        refresh_po_scores(student_ids, po_ids)
+    flush_versions()
+
+
+# Versiyon flush'ı önce çalışırsa (on_commit sırası) hücreler sayaçlardan önce yazılır
+before_version_flush(flush)
+
+
+def mark_grades_dirty(pairs):
+    """
+    bulk_create/update signal göndermez; toplu not yazımından sonra
+    (student_id, assessment_id) çiftleri için hücreleri tek sorguyla işaretle.
+    """
+    pairs = list(pairs)
+    po_ids = defaultdict(set)
+    for assessment_id, po_id in LoToPoMapping.objects.filter(
+        learning_outcome__assessment_mappings__assessment_id__in={a_id for _, a_id in pairs}
+    ).values_list('learning_outcome__assessment_mappings__assessment_id', 'program_outcome_id'):
+        po_ids[assessment_id].add(po_id)
+    for student_id, assessment_id in pairs:
+        mark_dirty([student_id], po_ids[assessment_id])
+    mark_changed(PO_STATS)
+    mark_changed(table_version(Grade))
+
+
+# Her model için: (signal'a giren FK alanları, etkilenen hücreleri bulan fonksiyon)
+TRACKED_MODELS = {
+    Grade: (('student_id', 'assessment_id'), grade_dependents),
+    AssessmentToLoMapping: (('assessment_id', 'learning_outcome_id'), assessment_mapping_dependents),
+    LoToPoMapping: (('learning_outcome_id', 'program_outcome_id'), lo_mapping_dependents),
+}
+
+
+def _mark_instance(instance, keys=None, schedule=True):
+    fields, resolve = TRACKED_MODELS[type(instance)]
+    if keys is None:
+        keys = [getattr(instance, field) for field in fields]
+    student_ids, po_ids = resolve(*keys)
+    # Sorgular on_commit'ten önce çalışmalı: cascade sonrası satırlar yok olur
+    mark_dirty(list(student_ids), list(po_ids), schedule=schedule)
+
+
+# Mapping tabloları, PO'lar ve assessment total_points: MappingGraph cache'i.
+# Skor receiver'larından önce bağlanmalı: autocommit'te save sonrası flush hemen
+# çalışır ve grafik versiyonu o anda artmış olmalı.
+@receiver(post_save, sender=AssessmentToLoMapping)
+@receiver(post_save, sender=LoToPoMapping)
+@receiver(post_save, sender=ProgramOutcome)
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=AssessmentToLoMapping)
+@receiver(post_delete, sender=LoToPoMapping)
+@receiver(post_delete, sender=ProgramOutcome)
+@receiver(post_delete, sender=Assessment)
+def mapping_graph_source_changed(sender, raw=False, **kwargs):
+    if not raw:
+        mark_changed(MAPPING_GRAPH)
+
+
+@receiver(pre_save, sender=Grade)
+@receiver(pre_save, sender=AssessmentToLoMapping)
+@receiver(pre_save, sender=LoToPoMapping)
+def score_source_pre_save(sender, instance, raw=False, **kwargs):
+    """FK değişirse eski hücreler de etkilenir"""
+    if raw or instance.pk is None:
+        return
+    fields, _ = TRACKED_MODELS[sender]
+    old_keys = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+    if old_keys is not None and list(old_keys) != [getattr(instance, field) for field in fields]:
+        _mark_instance(instance, old_keys, schedule=False)
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_save, sender=AssessmentToLoMapping)
+@receiver(post_save, sender=LoToPoMapping)
+def score_source_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _mark_instance(instance)
+
+
+@receiver(pre_delete, sender=Grade)
+@receiver(pre_delete, sender=AssessmentToLoMapping)
+@receiver(pre_delete, sender=LoToPoMapping)
+def score_source_deleted(sender, instance, **kwargs):
+    _mark_instance(instance)
+
+
+@receiver(pre_save, sender=Assessment)
+def assessment_pre_save(sender, instance, raw=False, **kwargs):
+    """total_points değişirse notu olan öğrencilerin yüzdeleri değişir"""
+    if raw or instance.pk is None:
+        return
+    old_total = sender.objects.filter(pk=instance.pk).values_list('total_points', flat=True).first()
+    if old_total is not None and old_total != instance.total_points:
+        student_ids, po_ids = assessment_dependents(instance.pk)
+        mark_dirty(list(student_ids), list(po_ids), schedule=False)
+
+
+@receiver(post_save, sender=Assessment)
+def assessment_saved(sender, instance, raw=False, **kwargs):
+    if not raw and _pending():
+        transaction.on_commit(flush)
+
+
+# ============ CACHE VERSIONS ============
+
+# Assessment: total_points yüzdeleri değiştirir
+@receiver(post_save, sender=Grade)
+@receiver(post_save, sender=AssessmentToLoMapping)
+@receiver(post_save, sender=LoToPoMapping)
+@receiver(post_save, sender=ProgramOutcome)
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Grade)
+@receiver(post_delete, sender=AssessmentToLoMapping)
+@receiver(post_delete, sender=LoToPoMapping)
+@receiver(post_delete, sender=ProgramOutcome)
+@receiver(post_delete, sender=Assessment)
+def po_stats_source_changed(sender, raw=False, **kwargs):
+    if not raw:
+        mark_changed(PO_STATS)
+
+
+# ============ TABLE VERSIONS (HTTP ETag / Last-Modified) ============
+
+VERSIONED_MODELS = (
+    Course, ProgramOutcome, LearningOutcome, LoToPoMapping, Student,
+    Assessment, AssessmentToLoMapping, Grade, UserProfile, User,
+)
+
+
+def table_changed(sender, raw=False, update_fields=None, **kwargs):
+    # Login sadece User.last_login'i günceller; API yanıtlarını değiştirmez
+    if raw or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    mark_changed(table_version(sender))
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(table_changed, sender=model, dispatch_uid=f'table_version_save:{model._meta.label}')
+    post_delete.connect(table_changed, sender=model, dispatch_uid=f'table_version_delete:{model._meta.label}')
+
+
+@receiver(m2m_changed, sender=Assessment.learning_outcomes.through)
+def assessment_learning_outcomes_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        mark_changed(table_version(Assessment))
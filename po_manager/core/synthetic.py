@@ -0,0 +1,209 @@
+"""
+Sentetik veri üretici (benchmark ve büyük ölçekli seed için).
+
+Bölüm / ders / LO / PO / assessment / mapping / öğrenci / not satırları
+bulk_create ile yazılır; öğrenci şifresi bir kez hash'lenip tüm kullanıcılara
+verilir; notlar batch'ler halinde executemany ile eklenir. Aynı `seed` aynı
+veriyi üretir. Bulk insert signal göndermediği için StudentPoScore tablosu
+üretimden sonra `refresh_po_scores` ile doldurulur.
+"""
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+from .caching import MAPPING_GRAPH, PO_STATS, mark_changed, mark_tables_changed
+from .models import (
+    Course, ProgramOutcome, LearningOutcome, LoToPoMapping,
+    Student, Assessment, AssessmentToLoMapping, Grade
+)
+
+BATCH_SIZE = 5000
+SEMESTERS = ['2024-Fall', '2025-Spring']
+ASSESSMENT_TYPES = [choice for choice, _ in Assessment.ASSESSMENT_TYPES]
+
+
+def _batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bulk_create(model, rows):
+    created = []
+    for batch in _batched(rows):
+        created.extend(model.objects.bulk_create(batch))
+    return created
+
+
+def _insert_rows(model, fields, rows, batch_size=BATCH_SIZE):
+    """
+    Satır tuple'larını batch başına bir transaction'da executemany ile ekle.
+    Milyonlarca notta bulk_create'in model örneği ve SQL derleme maliyeti
+    üretimin çoğunu oluşturur; signal/default gerektirmeyen düz kolonlar için.
+    """
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(field).column) for field in fields)
+    sql = (
+        f"INSERT INTO {quote(model._meta.db_table)} ({columns}) "
+        f"VALUES ({', '.join(['%s'] * len(fields))})"
+    )
+    inserted = 0
+    for batch in _batched(rows, batch_size):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, batch)
+        inserted += len(batch)
+    return inserted
+
+
+def generate_dataset(students=1000, courses=20, program_outcomes=10, los_per_course=4,
+                     assessments_per_course=4, courses_per_student=6,
+                     departments=('CSE', 'EEE', 'ME'), seed=0, password='password123',
+                     batch_size=BATCH_SIZE):
+    """
+    Sentetik bir fakülte oluştur ve oluşturulan satır sayılarını döndür.
+    Her öğrenci kendi bölümünden `courses_per_student` derse kayıtlıdır ve
+    o derslerin tüm assessment'larından not alır. Notlar `batch_size`'lık
+    transaction'larla yazılır.
+    """
+    rng = random.Random(seed)
+    with transaction.atomic():
+        counts, student_rows, course_rows, assessment_rows = _generate_catalog(
+            rng, students, courses, program_outcomes, los_per_course,
+            assessments_per_course, list(departments), password,
+        )
+    # Katalog bulk_create ile yazıldı (signal yok): grafik cache'i ve tablo versiyonları eskidi
+    mark_changed(MAPPING_GRAPH)
+    mark_tables_changed(
+        ProgramOutcome, Course, LearningOutcome, LoToPoMapping, Assessment,
+        AssessmentToLoMapping, User, Student,
+    )
+
+    courses_by_dept = {}
+    for course in course_rows:
+        courses_by_dept.setdefault(course.department, []).append(course.id)
+    assessments_by_course = {}
+    for assessment in assessment_rows:
+        assessments_by_course.setdefault(assessment.course_id, []).append(assessment.id)
+
+    def grade_rows():
+        for student in student_rows:
+            # Öğrenci profili: başarılı / orta / zayıf (seed_students.py ile aynı aralıklar)
+            low, high = rng.choice([(0.80, 1.00), (0.50, 0.85), (0.20, 0.60)])
+            dept_courses = courses_by_dept.get(student.department, [])
+            for course_id in rng.sample(dept_courses, min(courses_per_student, len(dept_courses))):
+                for assessment_id in assessments_by_course[course_id]:
+                    yield assessment_id, student.id, round(100 * rng.uniform(low, high), 1)
+
+    counts['grades'] = _insert_rows(Grade, ('assessment', 'student', 'points'), grade_rows(), batch_size)
+    # Bulk insert signal göndermez: chatbot PO istatistikleri cache'i elle geçersiz kılınır
+    mark_changed(PO_STATS)
+    mark_tables_changed(Grade)
+    return counts
+
+
+def _generate_catalog(rng, students, courses, program_outcomes, los_per_course,
+                      assessments_per_course, departments, password):
+    """Notlar dışındaki her şey; (satır sayıları, öğrenciler, dersler, assessment'lar)"""
+    # Aynı veritabanına tekrar çalıştırıldığında kodlar çakışmasın
+    start = Student.objects.count()
+    course_start = Course.objects.count()
+
+    pos = list(ProgramOutcome.objects.order_by('id'))
+    if len(pos) < program_outcomes:
+        pos += _bulk_create(ProgramOutcome, (
+            ProgramOutcome(code=f'PO{i + 1}', description=f'Program outcome {i + 1}')
+            for i in range(len(pos), program_outcomes)
+        ))
+    pos = pos[:program_outcomes]
+
+    instructors = {
+        dept: User.objects.get_or_create(
+            username=f'instructor_{dept.lower()}', defaults={'first_name': dept, 'last_name': 'Instructor'}
+        )[0]
+        for dept in departments
+    }
+
+    course_rows = _bulk_create(Course, (
+        Course(
+            code=f'{departments[i % len(departments)]}-{course_start + i + 1:04}',
+            name=f'Synthetic Course {course_start + i + 1}',
+            semester=SEMESTERS[i % len(SEMESTERS)],
+            department=departments[i % len(departments)],
+            instructor=instructors[departments[i % len(departments)]],
+        )
+        for i in range(courses)
+    ))
+
+    lo_rows = _bulk_create(LearningOutcome, (
+        LearningOutcome(course=course, code=f'LO{i + 1}', description=f'{course.code} LO{i + 1}')
+        for course in course_rows
+        for i in range(los_per_course)
+    ))
+    los_by_course = {}
+    for lo in lo_rows:
+        los_by_course.setdefault(lo.course_id, []).append(lo)
+
+    lo_po_rows = _bulk_create(LoToPoMapping, (
+        LoToPoMapping(learning_outcome=lo, program_outcome=po, contribution_weight=rng.randint(1, 5))
+        for lo in lo_rows
+        for po in rng.sample(pos, min(2, len(pos)))
+    ))
+
+    first_day = date(2024, 10, 1)
+    assessment_rows = _bulk_create(Assessment, (
+        Assessment(
+            course=course,
+            name=f'{ASSESSMENT_TYPES[i % len(ASSESSMENT_TYPES)].title()} {i + 1}',
+            assessment_type=ASSESSMENT_TYPES[i % len(ASSESSMENT_TYPES)],
+            total_points=100,
+            date=first_day + timedelta(weeks=3 * i),
+        )
+        for course in course_rows
+        for i in range(assessments_per_course)
+    ))
+    assessment_los = {
+        assessment.id: rng.sample(los_by_course[assessment.course_id], min(2, los_per_course))
+        for assessment in assessment_rows
+    }
+    assess_lo_rows = _bulk_create(AssessmentToLoMapping, (
+        AssessmentToLoMapping(assessment=assessment, learning_outcome=lo,
+                              contribution_weight=rng.choice([25, 50, 75, 100]))
+        for assessment in assessment_rows
+        for lo in assessment_los[assessment.id]
+    ))
+    _bulk_create(Assessment.learning_outcomes.through, (
+        Assessment.learning_outcomes.through(assessment_id=a_id, learningoutcome_id=lo.id)
+        for a_id, los in assessment_los.items()
+        for lo in los
+    ))
+
+    # Şifre bir kez hash'lenir: make_password kullanıcı başına ~yüzlerce ms sürer
+    password_hash = make_password(password)
+    student_nos = [str(2024_000000 + start + i + 1) for i in range(students)]
+    users = _bulk_create(User, (
+        User(username=student_no, password=password_hash, first_name='Student', last_name=student_no)
+        for student_no in student_nos
+    ))
+    student_rows = _bulk_create(Student, (
+        Student(user=user, student_no=student_no, department=departments[i % len(departments)])
+        for i, (user, student_no) in enumerate(zip(users, student_nos))
+    ))
+
+    counts = {
+        'program_outcomes': len(pos),
+        'courses': len(course_rows),
+        'learning_outcomes': len(lo_rows),
+        'lo_po_mappings': len(lo_po_rows),
+        'assessments': len(assessment_rows),
+        'assessment_lo_mappings': len(assess_lo_rows),
+        'students': len(student_rows),
+    }
+    return counts, student_rows, course_rows, assessment_rows
@@ -0,0 +1,115 @@
+"""
+Dönem kapatma: PO / LO sonuçlarının değişmez arşivi.
+
+`close_term` dönemin (Course.semester) tüm sonuçlarını bir kez hesaplar ve
+TermSnapshot tablolarına yazar:
+  - StudentPoSnapshot: öğrenci PO skorları, sadece o dönemin dersleri üzerinden
+  - CourseOutcomeSnapshot: ders başına LO / PO başarı özeti (attainment raporu)
+  - PoTermRollup: trend raporları için (ders, PO) skor toplamı / sayısı
+Geçmiş dönem raporları bu tablolardan okunur; canlı skorlama yoluna
+(notlar, mapping ağırlıkları) hiç gitmez ve sonradan değişmez.
+"""
+from django.db import transaction
+
+from .analytics import refresh_term_rollups
+from .attainment import DEFAULT_THRESHOLD, course_attainment, parse_threshold
+from .models import Course, CourseOutcomeSnapshot, Student, StudentPoSnapshot, TermSnapshot
+from .scoring import MappingGraph, cohort_scores, normalize
+
+SNAPSHOT_BATCH_SIZE = 2000
+
+
+def _student_rows(snapshot, courses):
+    """Dönem notları üzerinden öğrenci PO skorları; PO'ya ulaşmayan hücreler yazılmaz"""
+    graph = MappingGraph.load(courses=courses)
+    students = Student.objects.filter(grades__assessment__course__in=courses).distinct()
+    info = {
+        s_id: (student_no, department)
+        for s_id, student_no, department in students.values_list('id', 'student_no', 'department')
+    }
+    for chunk, weighted, weight_sums in cohort_scores(students, graph):
+        for row, s_id in enumerate(chunk):
+            student_no, department = info[s_id]
+            for p, po in enumerate(graph.program_outcomes):
+                if weight_sums[row, p] > 0:
+                    yield StudentPoSnapshot(
+                        snapshot=snapshot, student_id=s_id, student_no=student_no,
+                        department=department, program_outcome_id=po['id'], po_code=po['code'],
+                        score=round(normalize(weighted[row, p], weight_sums[row, p]), 2),
+                    )
+
+
+def _course_rows(snapshot, courses, threshold):
+    for course in courses:
+        report = course_attainment(course, threshold)
+        for kind, outcomes in (('lo', report['learning_outcomes']), ('po', report['program_outcomes'])):
+            for outcome in outcomes:
+                yield CourseOutcomeSnapshot(
+                    snapshot=snapshot, course=course, course_code=course.code,
+                    department=course.department, kind=kind,
+                    outcome_code=outcome['code'], description=outcome['description'],
+                    students=outcome['students'], average=outcome['average'],
+                    above_threshold_percent=outcome['above_threshold_percent'],
+                    distribution=outcome['distribution'],
+                )
+
+
+def _bulk_create(model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= SNAPSHOT_BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+@transaction.atomic
+def close_term(semester, threshold=DEFAULT_THRESHOLD, user=None):
+    """
+    Dönemi kapat ve arşivle. Dönem zaten kapatılmışsa, dersi yoksa veya eşik
+    0-100 arası sonlu bir sayı değilse ValueError.
+    """
+    try:
+        threshold = parse_threshold(threshold)
+    except (TypeError, ValueError):
+        raise ValueError(f"Geçersiz başarı eşiği: {threshold}")
+    if TermSnapshot.objects.filter(semester=semester).exists():
+        raise ValueError(f"{semester} dönemi zaten kapatılmış")
+    courses = list(Course.objects.filter(semester=semester).order_by('code'))
+    if not courses:
+        raise ValueError(f"{semester} dönemine ait ders yok")
+
+    # Kapatmadan önce: snapshot oluşunca dönemin rollup'ları donar
+    refresh_term_rollups(semester)
+    snapshot = TermSnapshot.objects.create(
+        semester=semester, closed_by=user, threshold=threshold, course_count=len(courses),
+        student_count=Student.objects.filter(grades__assessment__course__in=courses).distinct().count(),
+    )
+    _bulk_create(StudentPoSnapshot, _student_rows(snapshot, courses))
+    _bulk_create(CourseOutcomeSnapshot, _course_rows(snapshot, courses, threshold))
+    return snapshot
+
+
+def course_snapshot_report(snapshot, course_code):
+    """Arşivden `course_attainment` ile aynı biçimde rapor (ders yoksa None)"""
+    rows = list(snapshot.course_outcomes.filter(course_code=course_code))
+    if not rows:
+        return None
+    report = {'learning_outcomes': [], 'program_outcomes': []}
+    for row in rows:
+        report['learning_outcomes' if row.kind == 'lo' else 'program_outcomes'].append({
+            'code': row.outcome_code,
+            'description': row.description,
+            'students': row.students,
+            'average': row.average,
+            'above_threshold_percent': row.above_threshold_percent,
+            'distribution': row.distribution,
+        })
+    return {
+        'semester': snapshot.semester,
+        'course': {'id': rows[0].course_id, 'code': course_code},
+        'threshold': snapshot.threshold,
+        **report,
+    }
@@ -1,3 +1,1154 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import time
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from . import scoring, signals
+from .analytics import refresh_term_rollups
+from .authentication import AUTH_TOKENS, CachedTokenAuthentication, reset_token_generation, token_cache_key
+from .benchmarks import run_benchmarks
+from .caching import MAPPING_GRAPH, PO_STATS, bump_version, get_version, table_version, versioned_key
+from .chat_utils import get_all_po_stats, get_cached_po_stats
+from .grade_import import import_grades
+from .llm import FakeBackend, get_backend
+from .metrics import registry
+from .recompute import recompute_all
+from .scoring import materialized_po_scores, student_po_scores
+from .synthetic import generate_dataset
+from .terms import close_term
+from .models import (
+    Course, ProgramOutcome, LearningOutcome,
+    LoToPoMapping, Student, Assessment, AssessmentToLoMapping, Grade, UserProfile, StudentPoScore,
+    TermSnapshot
+)
+
+
+def create_course_data(index, students):
+    """Bir ders: 2 LO, 2 assessment, mapping'ler ve her öğrenci için notlar"""
+    instructor = User.objects.create_user(username=f'instructor{index}', first_name='Ada', last_name='Lovelace')
+    course = Course.objects.create(code=f'CSE{index:03}', name=f'Course {index}', instructor=instructor)
+    pos = list(ProgramOutcome.objects.all())
+    los = [
+        LearningOutcome.objects.create(course=course, code=f'LO{i}', description='lo')
+        for i in range(2)
+    ]
+    for lo in los:
+        for po in pos:
+            LoToPoMapping.objects.create(learning_outcome=lo, program_outcome=po, contribution_weight=1.0)
+    for i in range(2):
+        assessment = Assessment.objects.create(course=course, name=f'Exam {i}', total_points=100)
+        assessment.learning_outcomes.set(los)
+        for lo in los:
+            AssessmentToLoMapping.objects.create(assessment=assessment, learning_outcome=lo, contribution_weight=50)
+        for student in students:
+            Grade.objects.create(assessment=assessment, student=student, points=70)
+
+
+def create_student(index):
+    user = User.objects.create_user(username=f'student{index}')
+    UserProfile.objects.create(user=user)
+    return Student.objects.create(user=user, student_no=f'2024{index:04}')
+
+
+def reference_po_cells(student):
+    """Eski iç içe döngü (satır başına sorgu): PO başına (PO, ağırlıklı toplam, ağırlık toplamı)"""
+    for po in ProgramOutcome.objects.all():
+        total_weighted_score = total_weight_sum = 0
+        for lo_map in LoToPoMapping.objects.filter(program_outcome=po):
+            for assess_map in AssessmentToLoMapping.objects.filter(learning_outcome=lo_map.learning_outcome):
+                try:
+                    grade = Grade.objects.get(assessment=assess_map.assessment, student=student)
+                except Grade.DoesNotExist:
+                    continue
+                weight_factor = assess_map.contribution_weight * lo_map.contribution_weight
+                total_weighted_score += grade.percentage * weight_factor
+                total_weight_sum += weight_factor
+        yield po, total_weighted_score, total_weight_sum
+
+
+def reference_po_scores(student):
+    """Vektörel skorlama ile karşılaştırma için eski `po_scores` çıktısı"""
+    return [
+        {
+            'po_code': po.code,
+            'po_description': po.description,
+            'score': round(total / weight if weight > 0 else 0, 2),
+        }
+        for po, total, weight in reference_po_cells(student)
+    ]
+
+
+def reference_po_stats():
+    """Eski öğrenci başına `get_all_po_stats`: sadece PO'ya ulaşan notu olan öğrenciler sayılır"""
+    totals = {po.code: [po.description, 0, 0] for po in ProgramOutcome.objects.all()}
+    for student in Student.objects.all():
+        for po, total, weight in reference_po_cells(student):
+            if weight > 0:
+                totals[po.code][1] += total / weight
+                totals[po.code][2] += 1
+    return [
+        {
+            'code': code,
+            'description': description,
+            'average_score': round(score_sum / count if count else 0, 2),
+            'student_count': count,
+        }
+        for code, (description, score_sum, count) in totals.items()
+    ]
+
+
+def create_irregular_data():
+    """
+    Kenar durumlar: total_points=0, eksik notlar, PO'ya ulaşmayan LO / assessment,
+    hiç mapping'i olmayan PO ve farklı ağırlıklar.
+    """
+    pos = [ProgramOutcome.objects.create(code=f'PO{i}', description=f'po {i}') for i in range(3)]
+    course = Course.objects.create(code='CSE500', name='Irregular')
+    los = [LearningOutcome.objects.create(course=course, code=f'LO{i}', description='lo') for i in range(3)]
+    for lo, po, weight in ((los[0], pos[0], 1.0), (los[0], pos[1], 0.5), (los[1], pos[1], 2.0)):
+        LoToPoMapping.objects.create(learning_outcome=lo, program_outcome=po, contribution_weight=weight)
+    assessments = {}
+    for name, total, edges in (
+        ('A', 100, ((los[0], 60), (los[1], 40))),
+        ('B', 0, ((los[1], 30),)),
+        ('C', 50, ((los[2], 100),)),
+        ('D', 80, ((los[0], 20),)),
+    ):
+        assessments[name] = Assessment.objects.create(course=course, name=name, total_points=total)
+        for lo, weight in edges:
+            AssessmentToLoMapping.objects.create(assessment=assessments[name], learning_outcome=lo, contribution_weight=weight)
+    students = [create_student(i) for i in range(4)]
+    for student, grades in zip(students, (
+        {'A': 70, 'B': 5, 'C': 40, 'D': 60},
+        {'A': 30},
+        {},
+        {'B': 3, 'C': 50},
+    )):
+        for name, points in grades.items():
+            Grade.objects.create(assessment=assessments[name], student=student, points=points)
+    return students
+
+
+class ScoringEquivalenceTests(TestCase):
+    """Vektörel skorlama eski iç içe döngüyle aynı sonucu vermeli"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.students = create_irregular_data()
+
+    def test_student_scores_match_reference(self):
+        for student in self.students:
+            expected = reference_po_scores(student)
+            self.assertEqual(student_po_scores(student), expected)
+            self.assertEqual(materialized_po_scores(student), expected)
+            response = self.client.get(f'/api/students/{student.id}/po_scores/')
+            self.assertEqual(response.json()['po_scores'], expected)
+        # Sadece B (total_points=0) ve C (PO'ya ulaşmaz) notu: tüm skorlar 0
+        self.assertEqual([row['score'] for row in reference_po_scores(self.students[3])], [0, 0.0, 0])
+
+    def test_cohort_stats_match_reference(self):
+        create_course_data(1, self.students[1:])
+        self.assertEqual(get_all_po_stats(), reference_po_stats())
+        self.assertEqual([row['student_count'] for row in get_all_po_stats()], [4, 4, 3])
+
+    def test_cohort_stats_query_count_is_constant(self):
+        with CaptureQueriesContext(connection) as small:
+            get_all_po_stats()
+        for i in range(4, 12):
+            student = create_student(i)
+            Grade.objects.create(assessment=Assessment.objects.get(name='A'), student=student, points=i)
+        with CaptureQueriesContext(connection) as large:
+            stats = get_all_po_stats()
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(stats, reference_po_stats())
+
+    def count_po_scores_queries(self, student):
+        url = f'/api/students/{student.id}/po_scores/'
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_po_scores_query_count_is_constant(self):
+        small = self.count_po_scores_queries(self.students[0])
+        ProgramOutcome.objects.create(code='PO9', description='po')
+        create_course_data(1, self.students)
+        create_course_data(2, self.students[:2])
+        large = self.count_po_scores_queries(self.students[0])
+        self.assertEqual(small, large)
+        # student + versiyon (ETag) + PO listesi + hücreler
+        self.assertEqual(large, 4)
+
+
+class ListEndpointQueryCountTests(TestCase):
+    """List endpoint'lerinin sorgu sayısı satır sayısından bağımsız olmalı (N+1 koruması)"""
+
+    # endpoint → beklenen sorgu sayısı (ETag için versiyon sorgusu dahil)
+    ENDPOINTS = {
+        '/api/courses/': 2,
+        '/api/program-outcomes/': 2,
+        '/api/learning-outcomes/': 2,
+        '/api/mappings/': 2,
+        '/api/assessment-to-lo-mappings/': 2,
+        '/api/students/': 2,
+        '/api/assessments/': 3,
+        '/api/grades/': 2,
+    }
+    DETAIL_QUERIES = 5
+
+    def setUp(self):
+        self.client = APIClient()
+        for i in range(2):
+            ProgramOutcome.objects.create(code=f'PO{i}', description='po')
+
+    def add_rows(self, first_index, count):
+        students = [create_student(first_index + i) for i in range(count)]
+        for i in range(count):
+            create_course_data(first_index + i, students)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def test_list_query_count_is_constant(self):
+        self.add_rows(0, 2)
+        small = {url: self.count_queries(url) for url in self.ENDPOINTS}
+        self.add_rows(2, 4)
+        large = {url: self.count_queries(url) for url in self.ENDPOINTS}
+
+        self.assertEqual(small, large)
+        self.assertEqual(large, self.ENDPOINTS)
+
+    def test_course_detail_query_count_is_constant(self):
+        self.add_rows(0, 1)
+        course = Course.objects.first()
+        small = self.count_queries(f'/api/courses/{course.id}/detail/')
+        create_course_data(99, list(Student.objects.all()))
+        for i in range(3):
+            assessment = Assessment.objects.create(course=course, name=f'Extra {i}', total_points=10)
+            assessment.learning_outcomes.set(course.learning_outcomes.all())
+        large = self.count_queries(f'/api/courses/{course.id}/detail/')
+
+        self.assertEqual(small, large)
+        self.assertEqual(large, self.DETAIL_QUERIES)
+
+
+class DatabaseConfigTests(TestCase):
+    """Bağlantı ayarları; suite DB_ENGINE=sqlite ve DB_ENGINE=postgresql ile çalışır"""
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite PRAGMA'ları")
+    def test_sqlite_pragmas_applied(self):
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), settings.SQLITE_BUSY_TIMEOUT)
+        # Test veritabanı bellekte olduğunda WAL yerine 'memory' kalır
+        self.assertIn(self.pragma('journal_mode'), ('wal', 'memory'))
+
+    @skipUnless(connection.vendor == 'postgresql', "PostgreSQL connection pool")
+    def test_postgresql_pool_without_persistent_connections(self):
+        db = settings.DATABASES['default']
+        if 'pool' in db['OPTIONS']:
+            self.assertEqual(db['CONN_MAX_AGE'], 0)
+
+
+@override_settings(API_METRICS=True, MIDDLEWARE=['core.metrics.MetricsMiddleware'] + settings.MIDDLEWARE)
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        registry.reset()
+        ProgramOutcome.objects.create(code='PO1', description='po')
+        create_course_data(0, [create_student(0)])
+
+    def test_server_timing_and_prometheus_output(self):
+        student = Student.objects.get()
+        response = self.client.get(f'/api/students/{student.id}/po_scores/')
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"$')
+
+        body = self.client.get('/api/_metrics').content.decode()
+        self.assertIn('po_manager_requests_total{route="student-po-scores",method="GET",status="200"} 1', body)
+        self.assertIn('# TYPE po_manager_request_duration_seconds histogram', body)
+        self.assertIn('po_manager_request_duration_seconds_bucket{route="student-po-scores",method="GET",le="+Inf"} 1', body)
+        self.assertIn('po_manager_request_db_queries_count{route="student-po-scores",method="GET"} 1', body)
+
+        # Kümülatif bucket'lar: sorgu sayısı kadar ve üstündeki her bucket 1
+        queries = int(response['Server-Timing'].split('desc="')[1].split()[0])
+        for le, expected in (('1', int(queries <= 1)), ('500', 1)):
+            self.assertIn(
+                f'po_manager_request_db_queries_bucket{{route="student-po-scores",method="GET",le="{le}"}} {expected}',
+                body,
+            )
+
+
+class BenchmarkSmokeTests(TestCase):
+    """`manage.py benchmark` senaryoları küçük sentetik veriyle çalışmalı"""
+
+    def test_scenarios_run_on_synthetic_data(self):
+        dataset = generate_dataset(students=9, courses=3, program_outcomes=3, courses_per_student=1)
+        self.assertEqual(dataset['grades'], 9 * 1 * 4)
+
+        results = run_benchmarks(iterations=2, bulk_rows=5)
+        self.assertEqual(set(results), {'po_scores', 'get_all_po_stats', 'grades_list', 'bulk_ingest'})
+        self.assertEqual(results['grades_list']['queries'], 2)
+        for stats in results.values():
+            self.assertGreater(stats['throughput_per_s'], 0)
+
+
+class CourseAttainmentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for i in range(2):
+            ProgramOutcome.objects.create(code=f'PO{i}', description='po')
+
+    def test_attainment_query_count_is_constant(self):
+        create_course_data(0, [create_student(i) for i in range(2)])
+        course = Course.objects.get()
+        url = f'/api/courses/{course.id}/attainment/?threshold=65'
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+        for student in [create_student(i) for i in range(2, 8)]:
+            for assessment in course.assessments.all():
+                Grade.objects.create(assessment=assessment, student=student, points=50)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(len(large), 3)  # versiyonlar (ETag) + ders + özet sorgusu
+        po = response.json()['program_outcomes'][0]
+        self.assertEqual(po['students'], 8)
+        self.assertEqual(po['average'], 55.0)
+        self.assertEqual(po['above_threshold_percent'], 25.0)
+        self.assertEqual(po['distribution']['40-60'], 6)
+        self.assertEqual(po['distribution']['60-80'], 2)
+
+    def test_invalid_threshold_is_rejected(self):
+        create_course_data(0, [create_student(0)])
+        url = f'/api/courses/{Course.objects.get().id}/attainment/'
+        for threshold in ('nan', 'inf', '-inf', '1e999', '-1', '101', 'abc'):
+            response = self.client.get(url, {'threshold': threshold})
+            self.assertEqual(response.status_code, 400, threshold)
+            self.assertIn('error', response.json())
+        self.assertEqual(self.client.get(url, {'threshold': '100'}).status_code, 200)
+
+
+class DependencyIndexTests(TestCase):
+    """Bir edge / assessment değişikliği sadece etkilenen (öğrenci × PO) hücrelerini yeniden hesaplar"""
+
+    def setUp(self):
+        self.client = APIClient()
+        for i in range(2):
+            ProgramOutcome.objects.create(code=f'PO{i}', description='po')
+        create_course_data(0, [create_student(i) for i in range(3)])
+        create_course_data(1, [create_student(i) for i in range(3, 8)])
+
+    def test_edge_impact_is_limited_to_course_students(self):
+        mapping = LoToPoMapping.objects.filter(learning_outcome__course__code='CSE000').first()
+        response = self.client.get(f'/api/mappings/{mapping.id}/impact/')
+        self.assertEqual(response.json(), {'students': 3, 'program_outcomes': 1, 'cells': 3})
+
+        mapping = AssessmentToLoMapping.objects.filter(assessment__course__code='CSE001').first()
+        response = self.client.get(f'/api/assessment-to-lo-mappings/{mapping.id}/impact/')
+        self.assertEqual(response.json(), {'students': 5, 'program_outcomes': 2, 'cells': 10})
+
+    def test_total_points_change_refreshes_scores(self):
+        student = Student.objects.get(student_no='20240000')
+        self.client.get(f'/api/students/{student.id}/po_scores/')
+        self.assertEqual(set(StudentPoScore.objects.filter(student=student).values_list('score', flat=True)), {70.0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for assessment in Assessment.objects.filter(course__code='CSE000'):
+                assessment.total_points = 140
+                assessment.save()
+        self.assertEqual(set(StudentPoScore.objects.filter(student=student).values_list('score', flat=True)), {50.0})
+
+
+class PoScoreViewSetTests(TestCase):
+    URL = '/api/po-scores/'
+
+    def setUp(self):
+        self.client = APIClient()
+        for code in ('PO1', 'PO2'):
+            ProgramOutcome.objects.create(code=code, description='po')
+        self.students = [create_student(i) for i in range(6)]
+        create_course_data(0, self.students[:3])
+        create_course_data(1, self.students[2:5])
+        self.course0, self.course1 = Course.objects.order_by('code')
+        Course.objects.filter(pk=self.course1.pk).update(semester='2025-Spring')
+        Student.objects.filter(pk__in=[self.students[3].pk, self.students[4].pk]).update(department='EE')
+
+    def student_nos(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return [row['student'] for row in response.json()['results']]
+
+    def nos(self, *indexes):
+        return [self.students[i].student_no for i in indexes]
+
+    def test_filters(self):
+        self.assertEqual(self.student_nos(), self.nos(0, 1, 2, 3, 4, 5))
+        self.assertEqual(self.student_nos(course=self.course0.id), self.nos(0, 1, 2))
+        self.assertEqual(self.student_nos(semester='2025-Spring'), self.nos(2, 3, 4))
+        self.assertEqual(self.student_nos(department='EE'), self.nos(3, 4))
+        ids = f'{self.students[1].id},{self.students[4].id}'
+        self.assertEqual(self.student_nos(ids=ids), self.nos(1, 4))
+        self.assertEqual(self.student_nos(ids=ids, course=self.course1.id, department='EE'), self.nos(4))
+
+        row = self.client.get(self.URL, {'ids': self.students[2].id}).json()['results'][0]
+        self.assertEqual(row['po_scores'], reference_po_scores(self.students[2]))
+
+    def test_non_numeric_ids_are_rejected(self):
+        for params in ({'ids': '1,x'}, {'ids': '1,,2'}, {'course': 'CSE000'}):
+            response = self.client.get(self.URL, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', response.json())
+
+    def test_pagination(self):
+        first = self.client.get(self.URL, {'page_size': 4}).json()
+        self.assertEqual((first['count'], len(first['results'])), (6, 4))
+        self.assertIsNotNone(first['next'])
+        second = self.client.get(self.URL, {'page_size': 4, 'page': 2}).json()
+        self.assertEqual([row['student'] for row in second['results']], self.nos(4, 5))
+        self.assertIsNone(second['next'])
+        self.assertEqual(self.client.get(self.URL, {'page_size': 4, 'page': 3}).status_code, 404)
+
+    def count_queries(self, page_size):
+        params = {'page_size': page_size}
+        # İlk istek eksik hücreleri doldurur
+        self.client.get(self.URL, params)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.URL, params).status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_constant(self):
+        small = self.count_queries(2)
+        students = [create_student(i) for i in range(6, 20)]
+        create_course_data(2, students)
+        ProgramOutcome.objects.create(code='PO3', description='po')
+        large = self.count_queries(15)
+        self.assertEqual(small, large)
+        # versiyon (ETag) + count + sayfa + PO listesi + hücreler
+        self.assertEqual(large, 5)
+
+
+class CsvExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for code in ('PO1', 'PO2'):
+            ProgramOutcome.objects.create(code=code, description='po')
+        self.students = [create_student(i) for i in range(3)]
+        create_course_data(0, self.students[:2])
+        create_course_data(1, self.students[1:])
+        self.course0 = Course.objects.get(code='CSE000')
+        Grade.objects.filter(assessment__course=self.course0, student=self.students[0]).update(points=40)
+
+    def rows(self, url, params=None):
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        return list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_grades_export(self):
+        header, *rows = self.rows('/api/grades/export.csv')
+        self.assertEqual(header, ['student_no', 'course', 'assessment', 'points', 'total_points', 'percentage'])
+        self.assertEqual(len(rows), Grade.objects.count())
+        self.assertEqual(rows[0], [self.students[0].student_no, 'CSE000', 'Exam 0', '40.0', '100.0', '40.0'])
+
+        _, *rows = self.rows('/api/grades/export.csv', {'course': self.course0.id, 'student': self.students[1].id})
+        self.assertEqual([(row[0], row[1]) for row in rows], [(self.students[1].student_no, 'CSE000')] * 2)
+
+    def test_po_scores_export(self):
+        header, *rows = self.rows('/api/reports/po-scores.csv')
+        self.assertEqual(header, ['student_no', 'PO1', 'PO2'])
+        self.assertEqual(rows, [
+            [student.student_no, *(str(row['score']) for row in reference_po_scores(student))]
+            for student in self.students
+        ])
+
+        _, *rows = self.rows('/api/reports/po-scores.csv', {'course': self.course0.id})
+        self.assertEqual([row[0] for row in rows], [student.student_no for student in self.students[:2]])
+        self.assertEqual(rows[0][1:], ['40.0', '40.0'])
+
+    def test_invalid_course_is_rejected(self):
+        for url in ('/api/grades/export.csv', '/api/reports/po-scores.csv'):
+            response = self.client.get(url, {'course': 'CSE000'})
+            self.assertEqual(response.status_code, 400, url)
+            self.assertFalse(response.streaming)
+
+
+class CachedPoStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        ProgramOutcome.objects.create(code='PO1', description='po')
+        create_course_data(0, [create_student(i) for i in range(2)])
+
+    def test_second_call_hits_cache(self):
+        stats = get_cached_po_stats()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(get_cached_po_stats(), stats)
+        # Sadece versiyon sorgusu
+        self.assertEqual(len(queries), 1)
+
+    def test_committed_changes_produce_new_key(self):
+        self.assertEqual(get_cached_po_stats()[0]['average_score'], 70.0)
+        key = versioned_key(PO_STATS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            grade = Grade.objects.first()
+            grade.points = 30
+            grade.save()
+        self.assertNotEqual(versioned_key(PO_STATS), key)
+        self.assertEqual(get_cached_po_stats()[0]['average_score'], 60.0)
+        key = versioned_key(PO_STATS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mapping = AssessmentToLoMapping.objects.get(assessment=grade.assessment, learning_outcome__code='LO0')
+            mapping.contribution_weight = 250
+            mapping.save()
+        self.assertNotEqual(versioned_key(PO_STATS), key)
+        self.assertEqual(get_cached_po_stats(), get_all_po_stats())
+        self.assertEqual(get_cached_po_stats(), reference_po_stats())
+
+
+class GradeImportTests(TestCase):
+    URL = '/api/grades/bulk/'
+
+    def setUp(self):
+        self.client = APIClient()
+        ProgramOutcome.objects.create(code='PO1', description='po')
+        self.students = [create_student(i) for i in range(2)]
+        create_course_data(0, self.students[:1])
+        self.exam0, self.exam1 = Assessment.objects.order_by('id')
+
+    def upload_csv(self, text):
+        upload = SimpleUploadedFile('grades.csv', text.encode(), content_type='text/csv')
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.URL, {'file': upload}, format='multipart')
+
+    def test_json_upsert_refreshes_scores(self):
+        student = self.students[0]
+        self.assertEqual(materialized_po_scores(student)[0]['score'], 70.0)
+
+        rows = [
+            {'student_no': student.student_no, 'assessment': self.exam0.id, 'points': 30},
+            {'student_no': self.students[1].student_no, 'assessment': str(self.exam1.id), 'points': '80.5'},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.URL, rows, format='json')
+        self.assertEqual(response.json(), {'success': True, 'processed': 2, 'saved': 2, 'errors': []})
+        self.assertEqual(Grade.objects.get(student=student, assessment=self.exam0).points, 30)
+        self.assertEqual(Grade.objects.filter(student=student).count(), 2)
+        self.assertEqual(Grade.objects.get(student=self.students[1]).points, 80.5)
+        # Chunk commit'inden sonra materialized hücreler güncel
+        self.assertEqual(StudentPoScore.objects.get(student=student).score, 50.0)
+        self.assertEqual(materialized_po_scores(self.students[1]), student_po_scores(self.students[1]))
+
+    def test_csv_rows_with_errors_are_reported_and_skipped(self):
+        no = self.students[0].student_no
+        response = self.upload_csv(
+            'student_no,assessment,points\n'
+            f'{no},{self.exam0.id},55\n'
+            f'99999999,{self.exam0.id},10\n'
+            f'{no},0,10\n'
+            f'{no},{self.exam1.id},nan\n'
+            f'{no},{self.exam1.id},inf\n'
+            f'{no},{self.exam1.id},1e999\n'
+            f'{no},{self.exam1.id},abc\n'
+        )
+        body = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((body['success'], body['processed'], body['saved']), (False, 7, 1))
+        self.assertEqual([error['row'] for error in body['errors']], [2, 3, 4, 5, 6, 7])
+        self.assertEqual(Grade.objects.get(student=self.students[0], assessment=self.exam0).points, 55)
+        self.assertEqual(Grade.objects.get(student=self.students[0], assessment=self.exam1).points, 70)
+
+    def test_non_finite_and_boolean_json_points_are_rejected(self):
+        no = self.students[0].student_no
+        rows = [{'student_no': no, 'assessment': self.exam0.id, 'points': points} for points in (True, 'NaN', '-inf')]
+        result = import_grades(rows)
+        self.assertEqual((result['saved'], len(result['errors'])), (0, 3))
+
+    def test_partial_success_across_chunks(self):
+        no = self.students[1].student_no
+        rows = [
+            {'student_no': no, 'assessment': self.exam0.id, 'points': 40},
+            {'student_no': no, 'assessment': self.exam1.id, 'points': 'inf'},
+            {'student_no': no, 'assessment': self.exam1.id, 'points': 60},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            result = import_grades(rows, chunk_size=2)
+        self.assertEqual((result['processed'], result['saved']), (3, 2))
+        self.assertEqual(result['errors'][0]['row'], 2)
+        self.assertEqual(StudentPoScore.objects.get(student=self.students[1]).score, 50.0)
+
+    def test_bad_csv_header_is_rejected(self):
+        response = self.upload_csv('student,assessment,score\n1,1,1\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('student_no', response.json()['message'])
+        self.assertEqual(self.client.post(self.URL, {'points': 1}, format='json').status_code, 400)
+
+
+class IncrementalMaintenanceTests(TestCase):
+    """Her değişiklik sadece etkilenen (öğrenci × PO) hücrelerini yeniden yazar; sonuç referansla aynı"""
+
+    def setUp(self):
+        self.pos = [ProgramOutcome.objects.create(code=f'PO{i}', description='po') for i in range(3)]
+        self.students = [create_student(i) for i in range(6)]
+        create_course_data(0, self.students[:3])
+        create_course_data(1, self.students[3:])
+        self.lo0, self.lo1 = LearningOutcome.objects.filter(course__code='CSE000').order_by('code')
+        self.exam0 = Assessment.objects.get(course__code='CSE000', name='Exam 0')
+        # FK değişikliği testleri için boş yer: (LO0, PO2) ve (Exam 0, LO1) yok
+        LoToPoMapping.objects.filter(learning_outcome=self.lo0, program_outcome=self.pos[2]).delete()
+        AssessmentToLoMapping.objects.filter(assessment=self.exam0, learning_outcome=self.lo1).delete()
+        Grade.objects.filter(assessment=self.exam0, student=self.students[1]).update(points=40)
+        # setUp signal'larının commit'lenmemiş hücreleri testleri etkilemesin
+        signals._pending().clear()
+        scoring.refresh_po_scores([student.id for student in self.students])
+
+    def cells(self):
+        return {
+            (s_id, po_id): (weighted_sum, weight_sum)
+            for s_id, po_id, weighted_sum, weight_sum in StudentPoScore.objects.values_list(
+                'student_id', 'program_outcome_id', 'weighted_sum', 'weight_sum'
+            )
+        }
+
+    def expected(self, students, pos):
+        return {(student.id, po.id) for student in students for po in pos}
+
+    def recomputed(self, change):
+        """`change`'i commit et; yeniden hesaplanan hücreleri döndür"""
+        cells = set()
+        original = signals.refresh_po_scores
+
+        def refresh(student_ids, program_outcome_ids=None):
+            student_ids = list(student_ids)
+            cells.update((s_id, po_id) for s_id in student_ids for po_id in program_outcome_ids)
+            return original(student_ids, program_outcome_ids)
+
+        before = self.cells()
+        with mock.patch.object(signals, 'refresh_po_scores', side_effect=refresh), \
+                self.captureOnCommitCallbacks(execute=True):
+            change()
+        after = self.cells()
+        self.assertLessEqual({key for key in after if after[key] != before.get(key)}, cells)
+        for student in self.students:
+            self.assertEqual(materialized_po_scores(student), reference_po_scores(student))
+        return cells
+
+    def test_grade_edit_fk_change_and_delete(self):
+        grade = Grade.objects.get(assessment=self.exam0, student=self.students[0])
+        grade.points = 10
+        self.assertEqual(self.recomputed(grade.save), self.expected(self.students[:1], self.pos[:2]))
+
+        # Not başka öğrenciye taşındı: eski ve yeni öğrencinin hücreleri
+        grade.student = self.students[3]
+        self.assertEqual(self.recomputed(grade.save), self.expected([self.students[0], self.students[3]], self.pos[:2]))
+
+        grade = Grade.objects.get(assessment=self.exam0, student=self.students[1])
+        self.assertEqual(self.recomputed(grade.delete), self.expected(self.students[1:2], self.pos[:2]))
+
+    def test_assessment_mapping_edit_fk_change_and_delete(self):
+        mapping = AssessmentToLoMapping.objects.get(assessment=self.exam0, learning_outcome=self.lo0)
+        mapping.contribution_weight = 10
+        # LO0 → PO0, PO1
+        self.assertEqual(self.recomputed(mapping.save), self.expected(self.students[:3], self.pos[:2]))
+
+        # LO0 → LO1: eski LO'nun ve yeni LO'nun PO'ları (LO1 → PO0, PO1, PO2)
+        mapping.learning_outcome = self.lo1
+        self.assertEqual(self.recomputed(mapping.save), self.expected(self.students[:3], self.pos))
+
+        mapping = AssessmentToLoMapping.objects.filter(assessment__course__code='CSE001').first()
+        self.assertEqual(self.recomputed(mapping.delete), self.expected(self.students[3:], self.pos))
+
+    def test_lo_mapping_edit_fk_change_and_delete(self):
+        mapping = LoToPoMapping.objects.get(learning_outcome=self.lo0, program_outcome=self.pos[0])
+        mapping.contribution_weight = 3.0
+        self.assertEqual(self.recomputed(mapping.save), self.expected(self.students[:3], self.pos[:1]))
+
+        mapping.program_outcome = self.pos[2]
+        self.assertEqual(self.recomputed(mapping.save), self.expected(self.students[:3], [self.pos[0], self.pos[2]]))
+
+        mapping = LoToPoMapping.objects.filter(
+            learning_outcome__course__code='CSE001', program_outcome=self.pos[1]
+        ).first()
+        self.assertEqual(self.recomputed(mapping.delete), self.expected(self.students[3:], self.pos[1:2]))
+
+    def test_rebuild_po_scores(self):
+        client = APIClient()
+        url = f'/api/students/{self.students[3].id}/po_scores/'
+        etag = client.get(url)['ETag']
+        # Signal'sız değişiklikler: tablo eskir
+        Grade.objects.filter(assessment__course__code='CSE001').update(points=15)
+        StudentPoScore.objects.filter(student=self.students[0]).delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_po_scores', chunk_size=2, stdout=io.StringIO())
+        response = client.get(url, headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['po_scores'][0]['score'], 15.0)
+        self.assertEqual(StudentPoScore.objects.count(), len(self.students) * len(self.pos))
+        for student in self.students:
+            self.assertEqual(materialized_po_scores(student), reference_po_scores(student))
+
+
+class MappingGraphTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for i in range(3):
+            ProgramOutcome.objects.create(code=f'PO{i}', description='po')
+        create_course_data(0, [create_student(i) for i in range(2)])
+        self.course = Course.objects.get()
+        self.url = f'/api/courses/{self.course.id}/mapping-graph/'
+
+    def test_put_applies_diff_and_refreshes_scores(self):
+        graph = self.client.get(self.url).json()
+        lo_po = [
+            {key: edge[key] for key in ('learning_outcome', 'program_outcome', 'contribution_weight')}
+            for edge in graph['lo_po']
+        ]
+        assessment_lo = [
+            {key: edge[key] for key in ('assessment', 'learning_outcome', 'contribution_weight')}
+            for edge in graph['assessment_lo']
+        ]
+        lo_po[0]['contribution_weight'] = 3.0
+        removed = lo_po.pop()
+        assessment_lo[0]['contribution_weight'] = 10
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(self.url, {'lo_po': lo_po, 'assessment_lo': assessment_lo}, format='json')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['changes'], {
+            'lo_po': {'created': 0, 'updated': 1, 'deleted': 1},
+            'assessment_lo': {'created': 0, 'updated': 1, 'deleted': 0},
+        })
+        self.assertEqual(body['recompute'], {'students': 2, 'program_outcomes': 3, 'cells': 6})
+        self.assertEqual(len(body['lo_po']), len(lo_po))
+        self.assertFalse(LoToPoMapping.objects.filter(
+            learning_outcome_id=removed['learning_outcome'], program_outcome_id=removed['program_outcome']
+        ).exists())
+        self.assertEqual(StudentPoScore.objects.count(), 6)
+
+    def test_put_rejects_edges_of_other_courses(self):
+        create_course_data(1, [])
+        other_lo = LearningOutcome.objects.exclude(course=self.course).first()
+        po = ProgramOutcome.objects.first()
+        edges = [{'learning_outcome': other_lo.id, 'program_outcome': po.id}]
+
+        response = self.client.put(self.url, {'lo_po': edges, 'assessment_lo': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('lo_po', response.json())
+        self.assertTrue(LoToPoMapping.objects.filter(learning_outcome__course=self.course).exists())
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_token_generation()
+        self.client = APIClient()
+        user = User.objects.create_user(username='instructor', password='secret', email='i@example.com')
+        UserProfile.objects.create(user=user, user_type='admin')
+        self.token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_lookup_and_logout_invalidation(self):
+        self.assertEqual(self.client.get('/api/courses/').status_code, 200)
+        # Cache isabetinde token / kullanıcı / profil / auth sayacı sorgusu yok: versiyon (ETag) + liste
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get('/api/courses/').status_code, 200)
+        self.assertEqual(len(queries), 2)
+
+        me = self.client.get('/api/auth/me/').json()['user']
+        self.assertEqual((me['username'], me['user_type']), ('instructor', 'admin'))
+
+        self.assertEqual(self.client.post('/api/auth/logout/').status_code, 200)
+        self.assertEqual(self.client.get('/api/courses/').status_code, 401)
+
+    def test_logout_reaches_other_worker_cache(self):
+        self.assertEqual(self.client.get('/api/courses/').status_code, 200)
+        key = token_cache_key(self.token.key)
+        entry = cache.get(key)
+        self.assertEqual(self.client.post('/api/auth/logout/').status_code, 200)
+        # İkinci worker: kendi locmem cache'indeki girdi logout'tan etkilenmez
+        cache.set(key, entry)
+        self.assertEqual(self.client.get('/api/courses/').status_code, 401)
+
+    def test_cached_user_fields_need_no_queries(self):
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = auth.authenticate_credentials(self.token.key)
+            self.assertEqual((user.username, user.email, user.is_staff, user.is_superuser), ('instructor', 'i@example.com', False, False))
+            self.assertTrue(user.is_authenticated and user.is_active)
+            self.assertEqual((token.user_id, token.user_type), (user.pk, 'admin'))
+        # USER_FIELDS dışındaki alanlar ilk erişimde yüklenir
+        with self.assertNumQueries(1):
+            self.assertIsNone(user.last_login)
+
+    @override_settings(AUTH_TOKEN_VERSION_TTL=60)
+    def test_other_worker_logout_seen_after_generation_ttl(self):
+        key = token_cache_key(self.token.key)
+        # Başka bir worker'daki logout: sadece veritabanındaki sayaç artar
+        bump_version(AUTH_TOKENS)
+        with self.assertNumQueries(0):
+            self.assertEqual(token_cache_key(self.token.key), key)
+        # Sayaç süresi dolunca yeniden okunur; eski girdiler bir daha kullanılmaz
+        with mock.patch('core.authentication.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertNotEqual(token_cache_key(self.token.key), key)
+
+    def test_deleted_user_with_cached_token_is_unauthorized(self):
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 200)
+        entry = cache.get(token_cache_key(self.token.key))
+        User.objects.filter(pk=self.token.user_id).delete()
+        # Kimlik doğrulama ile kullanıcı silinmesi arasında yarış: girdi güncel key altında
+        cache.set(token_cache_key(self.token.key), entry)
+        response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(response.json()['success'])
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/api/courses/')
+        User.objects.filter(pk=self.token.user_id).update(is_active=False)
+        User.objects.get(pk=self.token.user_id).save()
+        self.assertEqual(self.client.get('/api/courses/').status_code, 401)
+
+
+class TermSnapshotTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for code in ('PO1', 'PO2'):
+            ProgramOutcome.objects.create(code=code, description='po')
+        self.students = [create_student(i) for i in range(2)]
+        create_course_data(0, self.students)
+        create_course_data(1, self.students[:1])
+        Course.objects.filter(code='CSE000').update(semester='2024-Fall')
+        Course.objects.filter(code='CSE001').update(semester='2025-Spring')
+        Grade.objects.filter(assessment__course__code='CSE001').update(points=10)
+
+    def authenticate(self, user_type):
+        user = User.objects.create_user(username=f'{user_type}_user')
+        UserProfile.objects.create(user=user, user_type=user_type)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+
+    def test_close_requires_admin(self):
+        url = '/api/terms/close/'
+        self.assertEqual(self.client.post(url, {'semester': '2024-Fall'}, format='json').status_code, 401)
+        self.authenticate('instructor')
+        self.assertEqual(self.client.post(url, {'semester': '2024-Fall'}, format='json').status_code, 403)
+        self.assertFalse(TermSnapshot.objects.exists())
+
+    def test_concurrent_close_conflict(self):
+        self.authenticate('admin')
+
+        def close_concurrently(semester, *args, **kwargs):
+            # exists() kontrolünden sonra başka bir istek dönemi kapattı
+            TermSnapshot.objects.create(semester=semester, threshold=60)
+            raise IntegrityError
+
+        with mock.patch('core.views.close_term', side_effect=close_concurrently):
+            response = self.client.post('/api/terms/close/', {'semester': '2024-Fall'}, format='json')
+        self.assertEqual(response.status_code, 409)
+
+    def test_invalid_threshold_is_rejected(self):
+        self.authenticate('admin')
+        for threshold in ('nan', 'inf', '-1', '101', True):
+            response = self.client.post(
+                '/api/terms/close/', {'semester': '2024-Fall', 'threshold': threshold}, format='json',
+            )
+            self.assertEqual(response.status_code, 400, threshold)
+        self.assertFalse(TermSnapshot.objects.exists())
+        with self.assertRaises(ValueError):
+            close_term('2024-Fall', float('nan'))
+
+    def test_close_term_archives_term_results(self):
+        self.authenticate('admin')
+        response = self.client.post('/api/terms/close/', {'semester': '2024-Fall'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['course_count'], response.json()['student_count']), (1, 2))
+        snapshot_id = response.json()['id']
+
+        # Sonradan yapılan ağırlık / not değişiklikleri arşivi etkilemez
+        LoToPoMapping.objects.update(contribution_weight=3.0)
+        Grade.objects.update(points=0)
+
+        scores = self.client.get('/api/term-po-scores/', {'semester': '2024-Fall'}).json()['results']
+        self.assertEqual(len(scores), 4)
+        # Sadece dönemin dersi: diğer dönemdeki 10 puanlık notlar skora girmez
+        self.assertEqual({row['score'] for row in scores}, {70.0})
+
+        report = self.client.get(f'/api/terms/{snapshot_id}/attainment/', {'course': 'CSE000'}).json()
+        self.assertEqual([lo['average'] for lo in report['learning_outcomes']], [70.0, 70.0])
+        self.assertEqual(report['program_outcomes'][0]['above_threshold_percent'], 100.0)
+
+        again = self.client.post('/api/terms/close/', {'semester': '2024-Fall'}, format='json')
+        self.assertEqual(again.status_code, 409)
+        self.assertEqual(self.client.post('/api/terms/close/', {'semester': '2019'}, format='json').status_code, 400)
+
+    def test_po_trends_from_rollups(self):
+        close_term('2024-Fall')
+        refresh_term_rollups('2025-Spring')
+        Grade.objects.update(points=0)  # Trendler notlara gitmez
+
+        with CaptureQueriesContext(connection) as queries:
+            body = self.client.get('/api/analytics/po-trends/', {'department': 'CSE'}).json()
+        self.assertLessEqual(len(queries), 2)
+        self.assertEqual(body['terms'], ['2024-Fall', '2025-Spring'])
+        po1 = body['series'][0]
+        self.assertEqual(po1['po_code'], 'PO1')
+        self.assertEqual([(p['average'], p['count']) for p in po1['points']], [(70.0, 2), (10.0, 1)])
+
+        body = self.client.get('/api/analytics/po-trends/', {'from': '2025-Spring', 'group': 'course'}).json()
+        self.assertEqual(body['terms'], ['2025-Spring'])
+        self.assertEqual({s['course_code'] for s in body['series']}, {'CSE001'})
+        self.assertEqual(self.client.get('/api/analytics/po-trends/', {'group': 'x'}).status_code, 400)
+
+
+class RecomputeScoresTests(TestCase):
+    def test_recompute_after_bulk_reweight(self):
+        for code in ('PO1', 'PO2'):
+            ProgramOutcome.objects.create(code=code, description='po')
+        students = [create_student(i) for i in range(3)]
+        create_course_data(0, students)
+        Grade.objects.filter(student=students[0], assessment__name='Exam 0').update(points=20)
+        # queryset.update signal tetiklemez: materialized skorlar eskir
+        LoToPoMapping.objects.filter(learning_outcome__code='LO0').update(contribution_weight=4.0)
+        AssessmentToLoMapping.objects.filter(assessment__name='Exam 0').update(contribution_weight=10)
+
+        progress = []
+        count, cells, _ = recompute_all(workers=1, chunk_size=2, progress=lambda *args: progress.append(args[:3]))
+        self.assertEqual((count, cells), (3, 6))
+        self.assertEqual(progress, [(2, 3, 4), (3, 3, 6)])
+        for student in students:
+            self.assertEqual(materialized_po_scores(student), student_po_scores(student))
+
+
+class MappingGraphCacheTests(TransactionTestCase):
+    """Cache sadece transaction dışında kullanılır: gerçek commit'lerle test edilir"""
+
+    def setUp(self):
+        scoring._cached_graph = None
+        ProgramOutcome.objects.create(code='PO1', description='po')
+        self.student = create_student(0)
+        create_course_data(0, [self.student])
+        Grade.objects.filter(assessment__name='Exam 0').update(points=30)
+
+    def test_graph_reloaded_only_after_mapping_change(self):
+        self.assertEqual(student_po_scores(self.student)[0]['score'], 50.0)
+        # Grafik cache'te: versiyon + not sorgusu
+        with CaptureQueriesContext(connection) as queries:
+            student_po_scores(self.student)
+        self.assertEqual(len(queries), 2)
+
+        mapping = AssessmentToLoMapping.objects.filter(assessment__name='Exam 0').first()
+        mapping.contribution_weight = 150
+        mapping.save()
+        live = student_po_scores(self.student)
+        self.assertEqual(live[0]['score'], 43.33)
+        # Signal flush'ı da yeni grafikle hesapladı
+        self.assertEqual(materialized_po_scores(self.student), live)
+
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        ProgramOutcome.objects.create(code='PO1', description='po')
+        self.student = create_student(0)
+        create_course_data(0, [self.student])
+
+    def get(self, url, **headers):
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, headers=headers)
+        return response, len(queries)
+
+    def test_not_modified_until_table_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ProgramOutcome.objects.create(code='PO2', description='po')
+        response, _ = self.get('/api/program-outcomes/')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        # Değişiklik yok: sadece versiyon sorgusu, gövde yok
+        response, queries = self.get('/api/program-outcomes/', if_none_match=etag)
+        self.assertEqual((response.status_code, queries, response.content), (304, 1, b''))
+        self.assertEqual(self.get('/api/program-outcomes/?fields=id', if_none_match=etag)[0].status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProgramOutcome.objects.filter(code='PO2').get().delete()
+        response, _ = self.get('/api/program-outcomes/', if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_mapping_graph_etag_follows_node_renames(self):
+        course = Course.objects.get()
+        url = f'/api/courses/{course.id}/mapping-graph/'
+        etag = self.get(url)[0]['ETag']
+        self.assertEqual(self.get(url, if_none_match=etag)[0].status_code, 304)
+
+        # Yanıtta lo_code / po_code / assessment_name var
+        with self.captureOnCommitCallbacks(execute=True):
+            lo = LearningOutcome.objects.filter(course=course).first()
+            lo.code = 'LO9'
+            lo.save()
+        response = self.get(url, if_none_match=etag)[0]
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('LO9', {edge['lo_code'] for edge in response.json()['lo_po']})
+
+    def test_po_scores_etag_follows_grade_changes(self):
+        url = f'/api/students/{self.student.id}/po_scores/'
+        etag = self.get(url)[0]['ETag']
+        self.assertEqual(self.get(url, if_none_match=etag)[0].status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            grade = Grade.objects.first()
+            grade.points = 10
+            grade.save()
+        response = self.get(url, if_none_match=etag)[0]
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class VersionFlushOrderTests(TransactionTestCase):
+    """po_stats ve tablo sayaçları hücreler yeniden yazıldıktan sonra artmalı (yeni ETag = yeni skorlar)"""
+
+    def setUp(self):
+        scoring._cached_graph = None
+        ProgramOutcome.objects.create(code='PO1', description='po')
+        self.student = create_student(0)
+        create_course_data(0, [self.student])
+
+    def versions(self):
+        return [get_version(name) for name in (MAPPING_GRAPH, PO_STATS, table_version(Grade))]
+
+    def test_counters_bumped_after_refresh(self):
+        client = APIClient()
+        url = f'/api/students/{self.student.id}/po_scores/'
+        etag = client.get(url)['ETag']
+        before = self.versions()
+
+        seen = []
+        original = signals.refresh_po_scores
+
+        def refresh(*args):
+            seen.append(self.versions())
+            return original(*args)
+
+        with mock.patch.object(signals, 'refresh_po_scores', side_effect=refresh), transaction.atomic():
+            # Mapping önce: sayaçların on_commit callback'i refresh'ten önce kaydedilir
+            mapping = AssessmentToLoMapping.objects.filter(assessment__name='Exam 0').first()
+            mapping.contribution_weight = 150
+            mapping.save()
+            Grade.objects.filter(assessment__name='Exam 0').get().delete()
+
+        self.assertEqual(seen, [[before[0] + 1, before[1], before[2]]])
+        self.assertEqual(self.versions(), [version + 1 for version in before])
+        response = client.get(url, headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['po_scores'], materialized_po_scores(self.student))
+
+
+@override_settings(LLM_BACKEND='fake', LLM_FAKE_LATENCY=0, LLM_TIMEOUT=5)
+class ChatViewTests(TestCase):
+    URL = '/api/chat/'
+
+    def setUp(self):
+        cache.clear()
+        get_backend.cache_clear()
+        self.addCleanup(get_backend.cache_clear)
+        ProgramOutcome.objects.create(code='PO1', description='po')
+        create_course_data(0, [create_student(0)])
+
+    def post(self, data, url=URL):
+        return self.client.post(url, data, content_type='application/json')
+
+    def test_reply(self):
+        response = self.post({'message': 'PO1 nasıl?'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['response'].startswith('[fake] Prompt '))
+
+    def test_empty_message(self):
+        for data in ({}, {'message': ''}):
+            response = self.post(data)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.json())
+
+    @override_settings(LLM_FAKE_LATENCY=1, LLM_TIMEOUT=0.05)
+    def test_slow_backend_times_out(self):
+        response = self.post({'message': 'PO1 nasıl?'})
+        self.assertEqual(response.status_code, 504)
+        self.assertIn('0.05', response.json()['error'])
+
+    @override_settings(LLM_BACKEND='gemini', GEMINI_API_KEY='')
+    def test_gemini_requires_api_key(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_backend()
+
+    async def stream_events(self):
+        response = await self.async_client.post(
+            f'{self.URL}?stream=1', {'message': 'PO1 nasıl?'}, content_type='application/json',
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        events = []
+        for block in body.strip().split('\n\n'):
+            event, data = block.split('\n')
+            events.append((event.removeprefix('event: '), json.loads(data.removeprefix('data: '))))
+        return events
+
+    async def test_stream_events(self):
+        events = await self.stream_events()
+        names = [event for event, _ in events]
+        self.assertEqual((names[0], names[-1]), ('open', 'done'))
+        self.assertEqual(set(names[1:-1]), {'delta'})
+        text = ''.join(data['text'] for event, data in events if event == 'delta')
+        self.assertTrue(text.startswith('[fake] Prompt '))
+
+    @override_settings(LLM_BACKEND='core.tests.FailingStreamBackend')
+    async def test_stream_error_mid_stream(self):
+        events = await self.stream_events()
+        self.assertEqual([event for event, _ in events], ['open', 'delta', 'error'])
+        self.assertEqual(events[-1][1], {'error': 'backend hatası'})
+
+    @override_settings(LLM_BACKEND='core.tests.StallingStreamBackend', LLM_TIMEOUT=0.05)
+    async def test_stream_timeout_mid_stream(self):
+        events = await self.stream_events()
+        self.assertEqual([event for event, _ in events], ['open', 'delta', 'error'])
+        self.assertIn('0.05', events[-1][1]['error'])
+
+
+class FailingStreamBackend(FakeBackend):
+    """İlk parçadan sonra hata veren backend (SSE testleri)"""
+
+    async def stream(self, prompt):
+        yield 'ilk'
+        raise RuntimeError('backend hatası')
+
+
+class StallingStreamBackend(FakeBackend):
+    """İlk parçadan sonra yanıt vermeyen backend (SSE testleri)"""
+
+    async def stream(self, prompt):
+        yield 'ilk'
+        await asyncio.sleep(1)
+        yield 'geç'
 
-# Create your tests here.
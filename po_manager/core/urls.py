@@ -9,12 +9,21 @@ router.register(r'learning-outcomes', views.LearningOutcomeViewSet)
 router.register(r'mappings', views.LoToPoMappingViewSet)
 router.register(r'assessment-to-lo-mappings', views.AssessmentToLoMappingViewSet)
 router.register(r'students', views.StudentViewSet)
+router.register(r'po-scores', views.PoScoreViewSet, basename='po-scores')
 router.register(r'assessments', views.AssessmentViewSet)
 router.register(r'grades', views.GradeViewSet)
+router.register(r'terms', views.TermSnapshotViewSet)
+router.register(r'term-po-scores', views.StudentPoSnapshotViewSet)
+router.register(r'term-course-outcomes', views.CourseOutcomeSnapshotViewSet)
 
 urlpatterns = [
+    # Router'ın format suffix pattern'inden (grades/<pk>.<format>) önce gelmeli
+    path('grades/export.csv', views.export_grades_view, name='grades-export'),
+    path('reports/po-scores.csv', views.export_po_scores_view, name='po-scores-export'),
     path('', include(router.urls)),
+    path('analytics/po-trends/', views.po_trends_view, name='po-trends'),
     path('chat/', views.chat_view, name='chat'),
+    path('_metrics', views.metrics_view, name='metrics'),
     # Auth endpoints
     path('auth/login/', views.login_view, name='login'),
     path('auth/logout/', views.logout_view, name='logout'),
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -54,6 +55,11 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# API_METRICS=1: route başına süre/sorgu/yanıt boyutu, Server-Timing header'ı ve /api/_metrics
+API_METRICS = os.environ.get('API_METRICS', '0') == '1'
+if API_METRICS:
+    MIDDLEWARE.insert(0, 'core.metrics.MetricsMiddleware')
+
 ROOT_URLCONF = 'po_manager.urls'
 
 TEMPLATES = [
@@ -77,12 +83,50 @@ WSGI_APPLICATION = 'po_manager.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=sqlite (varsayılan) veya postgresql; bağlantı bilgileri DB_* ortam değişkenlerinden
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DB_POOL = os.environ.get('DB_POOL', '1') == '1'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'po_manager'),
+            'USER': os.environ.get('DB_USER', 'po_manager'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # psycopg pool ile kalıcı bağlantı (CONN_MAX_AGE) birlikte kullanılamaz
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+                    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+                    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+                },
+            } if DB_POOL else {},
+        }
     }
-}
+elif DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Yazma kilidi transaction başında alınır; okuma→yazma yükseltmesinde
+                # busy_timeout atlanıp "database is locked" hatası alınmaz
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+else:
+    raise ValueError(f"Desteklenmeyen DB_ENGINE: {DB_ENGINE}")
+
+# SQLite bağlantı PRAGMA'ları (core/db.py, connection_created): WAL, synchronous=NORMAL
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000'))  # ms
 
 
 # Password validation
@@ -121,6 +165,43 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Django REST Framework
+# List endpoint'leri cursor ile sayfalanır; ?fields=, ?ordering= ve ViewSet'e özel filtreler desteklenir
+REST_FRAMEWORK = {
+    # Tek auth yolu: `Authorization: Token <key>`, token → kullanıcı cache'li (core/authentication.py)
+    'DEFAULT_AUTHENTICATION_CLASSES': ['core.authentication.CachedTokenAuthentication'],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.DefaultCursorPagination',
+    'PAGE_SIZE': 100,
+    'DEFAULT_FILTER_BACKENDS': [
+        'core.filters.QueryParamFilterBackend',
+        'rest_framework.filters.OrderingFilter',
+    ],
+}
+
+# Token → (kullanıcı alanları, user_type) cache süresi (saniye); logout'ta hemen silinir
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.environ.get('AUTH_TOKEN_CACHE_TIMEOUT', '300'))
+# Process içi cache'te: başka worker'daki logout'un en geç görülme süresi (saniye)
+AUTH_TOKEN_VERSION_TTL = float(os.environ.get('AUTH_TOKEN_VERSION_TTL', '1'))
+
+# Cache
+# Process içi varsayılan; invalidation DataVersion sayaçlarıyla yapıldığı için
+# çok worker'lı kurulumda da eski veri dönmez (bkz. core/caching.py)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'po-manager',
+    }
+}
+
+# Chatbot LLM backend: 'gemini', 'fake' (ağ erişimi olmadan yük testi) veya dotted path
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini')
+# Anahtar sadece ortamdan; boşsa gemini backend'i ilk kullanımda ImproperlyConfigured verir
+GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
+GEMINI_MODEL = os.environ.get('GEMINI_MODEL', 'gemini-2.0-flash')
+LLM_TIMEOUT = float(os.environ.get('LLM_TIMEOUT', '30'))
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '8'))
+LLM_FAKE_LATENCY = float(os.environ.get('LLM_FAKE_LATENCY', '0.5'))
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -13,6 +13,8 @@ django.setup()
 
 from django.contrib.auth.models import User
 from core.models import Course, Student, Assessment, Grade
+from core.caching import PO_STATS, mark_changed, mark_tables_changed
+from core.scoring import refresh_po_scores
 
 def create_student_data():
     print("🌱 Öğrenci ve not verileri oluşturuluyor...")
@@ -52,7 +54,8 @@ def create_student_data():
         print("   ! Hiç ders bulunamadı. Lütfen önce seed_cse311.py çalıştırın.")
         return
 
-    # 3. Notları oluştur
+    # 3. Notları oluştur (tek bulk upsert; büyük veri için: python manage.py seed)
+    grades = []
     for course in courses:
         assessments = course.assessments.all()
         if not assessments.exists():
@@ -77,12 +80,19 @@ def create_student_data():
                 # Puanı hesapla (Total points üzerinden)
                 points = round(assessment.total_points * base_score, 1)
                 
-                # Notu kaydet
-                Grade.objects.update_or_create(
-                    assessment=assessment,
-                    student=student,
-                    defaults={'points': points}
-                )
+                grades.append(Grade(assessment=assessment, student=student, points=points))
+    
+    Grade.objects.bulk_create(
+        grades,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['assessment', 'student'],
+        update_fields=['points'],
+    )
+    # bulk_create signal göndermez: materialized PO skorlarını ve cache'i yenile
+    refresh_po_scores([student.id for student in students])
+    mark_changed(PO_STATS)
+    mark_tables_changed(Grade)
                 
     print("✅ Tüm veriler başarıyla oluşturuldu!")
 